@@ -0,0 +1,178 @@
+"""Benchmark de todas as rotas da API.
+
+Exemplos:
+
+    python -m benchmarks --requests 200 --concurrency 8 --output atual.json
+    python -m benchmarks --baseline baseline.json  # sai com 1 se regredir
+    python -m benchmarks --url http://localhost:8000 --database test.db
+
+Sem `--url` a API roda no próprio processo (transporte ASGI do httpx) sobre
+um banco SQLite temporário. Com `--url` as requisições vão para um uvicorn
+já em execução; `--database` aponta para o banco dele para o seed (ou use
+`--no-seed` se ele já estiver populado). O token de empresa é assinado com
+as `JWT_KEYS` locais, que precisam ser as mesmas do servidor, e o servidor
+precisa de `LOGIN_RATE_PER_IP` e `LOGIN_RATE_PER_USERNAME` altos para que os
+logins não sejam recusados com 429 e da mesma `EXPORT_API_KEY` local.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('--users', type=int, default=1_000)
+    parser.add_argument('--companies', type=int, default=50)
+    parser.add_argument('--courses', type=int, default=2_000)
+    parser.add_argument('--enrollments', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--requests', type=int, default=100, help='requisições por rota'
+    )
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument(
+        '--only', action='append', help='roda só as rotas que contêm o texto'
+    )
+    parser.add_argument('--url', help='servidor já em execução')
+    parser.add_argument('--database', help='arquivo SQLite a popular')
+    parser.add_argument('--no-seed', action='store_true')
+    parser.add_argument('--output', help='grava o resultado em JSON')
+    parser.add_argument('--baseline', help='resultado anterior para comparar')
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.2,
+        help='piora relativa aceita em p95 e throughput (padrão 0.2)',
+    )
+    args = parser.parse_args(argv)
+
+    if args.url and not (args.database or args.no_seed):
+        parser.error('--url exige --database ou --no-seed')
+    if args.enrollments > args.users * args.courses:
+        parser.error('--enrollments maior que alunos x cursos')
+    return args
+
+
+def configure_environment(args):
+    # As settings são lidas no import de fast_tech: o banco precisa estar
+    # definido antes
+    database = args.database or os.path.join(tempfile.mkdtemp(), 'bench.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{database}'
+    # Todos os logins saem do mesmo IP e repetem usernames: o limite de
+    # tentativas mediria só respostas 429
+    for name in ('LOGIN_RATE_PER_IP', 'LOGIN_RATE_PER_USERNAME'):
+        os.environ.setdefault(name, '[1000000, 1000000]')
+    os.environ.setdefault('EXPORT_API_KEY', 'benchmark')
+
+
+async def run(args) -> dict:
+    import httpx  # noqa: PLC0415
+
+    from benchmarks.dataset import seed_dataset  # noqa: PLC0415
+    from benchmarks.runner import run_scenario  # noqa: PLC0415
+    from benchmarks.scenarios import SCENARIOS, BenchContext  # noqa: PLC0415
+    from fast_tech.app import create_app  # noqa: PLC0415
+    from fast_tech.security import create_access_token  # noqa: PLC0415
+    from fast_tech.settings import settings  # noqa: PLC0415
+
+    sizes = {
+        'users': args.users,
+        'companies': args.companies,
+        'courses': args.courses,
+        'enrollments': args.enrollments,
+        'deletable': args.requests,
+        'sessions': args.requests,
+    }
+    if not args.no_seed:
+        started = time.perf_counter()
+        seed_dataset(os.environ['DATABASE_URL'], sizes, args.seed)
+        print(f'seed: {time.perf_counter() - started:.1f}s', file=sys.stderr)
+
+    ctx = BenchContext(
+        sizes,
+        company_token=create_access_token({
+            'sub': 'empresa1',
+            'role': 'company',
+            'id': 1,
+        }),
+        export_key=settings.EXPORT_API_KEY,
+    )
+    scenarios = {
+        name: scenario
+        for name, scenario in SCENARIOS.items()
+        if not args.only or any(text in name for text in args.only)
+    }
+
+    endpoints = {}
+
+    async def run_all(client):
+        for name, scenario in scenarios.items():
+            endpoints[name] = await run_scenario(
+                client, ctx, scenario, args.requests, args.concurrency
+            )
+            print(
+                f'{name}: {endpoints[name]["throughput_rps"]:.1f} req/s, '
+                f'p95 {endpoints[name]["p95_ms"]:.1f} ms',
+                file=sys.stderr,
+            )
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=60) as client:
+            await run_all(client)
+    else:
+        app = create_app()
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url='http://bench', timeout=60
+            ) as client:
+                await run_all(client)
+
+    return {
+        'meta': {
+            'target': args.url or 'asgi',
+            'sizes': sizes,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'python': platform.python_version(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        },
+        'endpoints': endpoints,
+    }
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    configure_environment(args)
+    result = asyncio.run(run(args))
+
+    output = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+    if args.baseline:
+        from benchmarks.runner import compare  # noqa: PLC0415
+
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare(
+            result['endpoints'], baseline['endpoints'], args.tolerance
+        )
+        for regression in regressions:
+            print(f'REGRESSÃO {regression}', file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
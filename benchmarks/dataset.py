@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import insert
+
+from fast_tech.models import Curso, RefreshToken
+from fast_tech.refresh_tokens import hash_refresh_token
+from fast_tech.seed import create_seed_engine, seed
+from fast_tech.settings import settings
+
+# Senha de todos os usuários e empresas gerados
+BENCH_PASSWORD = 'benchmark'
+SESSION_KINDS = ('refresh', 'revoke')
+
+
+def bench_refresh_token(kind: str, i: int) -> str:
+    # Determinístico: os cenários remontam o token sem guardar estado
+    return f'bench-{kind}-{i}'
+
+
+def seed_dataset(url: str, sizes: dict, seed_value: int = 0):
+    engine = create_seed_engine(url)
+    try:
+        seed(engine, sizes, seed=seed_value, password=BENCH_PASSWORD)
+
+        # Cursos sem inscrições da empresa 1, reservados para as exclusões
+        courses, deletable = sizes['courses'], sizes.get('deletable', 0)
+        if deletable:
+            with engine.begin() as conn:
+                conn.execute(
+                    insert(Curso),
+                    [
+                        {
+                            'id': i,
+                            'name': f'Curso descartável {i}',
+                            'description': 'Reservado para exclusão',
+                            'youtube_link': f'https://youtu.be/bench{i}',
+                            'company_id': 1,
+                        }
+                        for i in range(courses + 1, courses + deletable + 1)
+                    ],
+                )
+
+        # Um refresh token de uso único por requisição de renovação e de
+        # logout, cada um na própria família
+        sessions = sizes.get('sessions', 0)
+        if sessions:
+            expires_at = datetime.now(tz=ZoneInfo('UTC')).replace(
+                tzinfo=None
+            ) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+            with engine.begin() as conn:
+                conn.execute(
+                    insert(RefreshToken),
+                    [
+                        {
+                            'token_hash': hash_refresh_token(
+                                bench_refresh_token(kind, i)
+                            ),
+                            'family': bench_refresh_token(kind, i),
+                            'role': 'student',
+                            'subject_id': i % sizes['users'] + 1,
+                            'expires_at': expires_at,
+                        }
+                        for kind in SESSION_KINDS
+                        for i in range(sessions)
+                    ],
+                )
+    finally:
+        # O seed abre o banco em modo exclusivo: libera antes da API usar
+        engine.dispose()
@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+from fast_tech.hashing import percentile
+
+
+def summarize(latencies, statuses: dict, accepted, elapsed: float) -> dict:
+    latencies_ms = [latency * 1000 for latency in latencies]
+    return {
+        'requests': len(latencies_ms),
+        'errors': sum(
+            count for code, count in statuses.items() if code not in accepted
+        ),
+        'status_codes': {
+            str(code): statuses[code] for code in sorted(statuses)
+        },
+        'throughput_rps': len(latencies_ms) / elapsed if elapsed else 0.0,
+        'mean_ms': (
+            sum(latencies_ms) / len(latencies_ms) if latencies_ms else 0.0
+        ),
+        'p50_ms': percentile(latencies_ms, 50),
+        'p95_ms': percentile(latencies_ms, 95),
+        'p99_ms': percentile(latencies_ms, 99),
+    }
+
+
+async def run_scenario(client, ctx, scenario, requests: int, concurrency: int):
+    method, accepted, build = scenario
+    latencies = []
+    statuses = {}
+    # Iterador compartilhado: cada worker pega o próximo índice livre
+    indexes = iter(range(requests))
+
+    async def worker():
+        for i in indexes:
+            kwargs = build(ctx, i)
+            started = time.perf_counter()
+            response = await client.request(method, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = (
+                statuses.get(response.status_code, 0) + 1
+            )
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(
+        latencies, statuses, accepted, time.perf_counter() - started
+    )
+
+
+def compare(endpoints: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, current in endpoints.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+
+        if current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(
+                f'{name}: p95 {previous["p95_ms"]:.1f} ms -> '
+                f'{current["p95_ms"]:.1f} ms'
+            )
+        if current['throughput_rps'] < previous['throughput_rps'] * (
+            1 - tolerance
+        ):
+            regressions.append(
+                f'{name}: throughput {previous["throughput_rps"]:.1f} -> '
+                f'{current["throughput_rps"]:.1f} req/s'
+            )
+        if current['errors'] > previous['errors']:
+            regressions.append(
+                f'{name}: erros {previous["errors"]} -> {current["errors"]}'
+            )
+    return regressions
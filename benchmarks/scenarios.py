@@ -0,0 +1,258 @@
+import itertools
+import json
+import uuid
+
+from benchmarks.dataset import BENCH_PASSWORD, bench_refresh_token
+from fast_tech.seed import TOPICS
+
+BULK_SIZE = 100
+# Cada cadastro custa um bcrypt: lotes menores nas rotas de registro
+REGISTRATION_BULK_SIZE = 10
+
+
+class BenchContext:
+    """Tamanhos do dataset e estado compartilhado entre as requisições."""
+
+    def __init__(
+        self,
+        sizes: dict,
+        company_token: str | None = None,
+        export_key: str | None = None,
+    ):
+        self.sizes = sizes
+        self.company_token = company_token
+        self.export_key = export_key
+        # Prefixo por execução: cadastros não colidem com rodadas anteriores
+        self.run = uuid.uuid4().hex[:8]
+        self.counter = itertools.count(1)
+
+    def unique(self) -> str:
+        return f'{self.run}{next(self.counter)}'
+
+    def pick(self, table: str, i: int) -> int:
+        return i % self.sizes[table] + 1
+
+
+def _user(ctx):
+    key = ctx.unique()
+    return {
+        'name': f'Bench {key}',
+        'username': f'bench{key}',
+        'email': f'bench{key}@bench.dev',
+        'phone': '11999999999',
+        'password': BENCH_PASSWORD,
+    }
+
+
+def _company(ctx):
+    key = ctx.unique()
+    return {
+        'cnpj': f'bench{key}',
+        'username': f'benchco{key}',
+        'email': f'benchco{key}@bench.dev',
+        'phone': '11999999999',
+        'password': BENCH_PASSWORD,
+    }
+
+
+def _course(ctx, i):
+    return {
+        'name': f'Curso de {TOPICS[i % len(TOPICS)]} {ctx.unique()}',
+        'description': 'Curso gerado pelo benchmark',
+        'youtube_link': 'https://youtu.be/bench',
+        'company_id': ctx.pick('companies', i),
+    }
+
+
+def _enrollment(ctx, i):
+    # Sorteio espalhado pela matriz aluno x curso; duplicatas viram 409
+    n = i * 7919 + next(ctx.counter)
+    return {
+        'student_id': ctx.pick('users', n),
+        'course_id': ctx.pick('courses', n // ctx.sizes['users']),
+    }
+
+
+def _courses_ndjson(ctx, i):
+    lines = (json.dumps(_course(ctx, i + j)) for j in range(BULK_SIZE))
+    return '\n'.join(lines).encode()
+
+
+def _delete_course(ctx, i):
+    # Apaga os cursos reservados pelo seed (empresa 1, sem inscrições)
+    return {
+        'url': f'/companies/my-courses/{ctx.sizes["courses"] + i + 1}',
+        'headers': {'Authorization': f'Bearer {ctx.company_token}'},
+    }
+
+
+# nome -> (método, status aceitos, função que monta a requisição)
+SCENARIOS = {
+    'POST /registerStudent': (
+        'POST',
+        {201},
+        lambda ctx, i: {'url': '/registerStudent', 'json': _user(ctx)},
+    ),
+    'POST /registerStudent/bulk': (
+        'POST',
+        {200},
+        lambda ctx, i: {
+            'url': '/registerStudent/bulk',
+            'json': {
+                'items': [_user(ctx) for _ in range(REGISTRATION_BULK_SIZE)]
+            },
+        },
+    ),
+    'GET /usuarios': (
+        'GET',
+        {200},
+        lambda ctx, i: {'url': '/usuarios', 'params': {'limit': 50}},
+    ),
+    'POST /login': (
+        'POST',
+        {200},
+        lambda ctx, i: {
+            'url': '/login',
+            'json': {
+                'username': f'aluno{ctx.pick("users", i)}',
+                'password': BENCH_PASSWORD,
+            },
+        },
+    ),
+    'POST /token/refresh': (
+        'POST',
+        {200},
+        lambda ctx, i: {
+            'url': '/token/refresh',
+            'json': {'refresh_token': bench_refresh_token('refresh', i)},
+        },
+    ),
+    'POST /token/revoke': (
+        'POST',
+        {204},
+        lambda ctx, i: {
+            'url': '/token/revoke',
+            'json': {'refresh_token': bench_refresh_token('revoke', i)},
+        },
+    ),
+    'POST /registerCompany': (
+        'POST',
+        {201},
+        lambda ctx, i: {'url': '/registerCompany', 'json': _company(ctx)},
+    ),
+    'POST /registerCompany/bulk': (
+        'POST',
+        {200},
+        lambda ctx, i: {
+            'url': '/registerCompany/bulk',
+            'json': {
+                'items': [_company(ctx) for _ in range(REGISTRATION_BULK_SIZE)]
+            },
+        },
+    ),
+    'POST /companyLogin': (
+        'POST',
+        {200},
+        lambda ctx, i: {
+            'url': '/companyLogin',
+            'json': {
+                'username': f'empresa{ctx.pick("companies", i)}',
+                'password': BENCH_PASSWORD,
+            },
+        },
+    ),
+    'POST /createCourses': (
+        'POST',
+        {200},
+        lambda ctx, i: {'url': '/createCourses', 'json': _course(ctx, i)},
+    ),
+    'POST /createCourses/bulk': (
+        'POST',
+        {200},
+        lambda ctx, i: {
+            'url': '/createCourses/bulk',
+            'params': {'format': 'ndjson'},
+            'files': {'file': ('cursos.ndjson', _courses_ndjson(ctx, i))},
+        },
+    ),
+    'GET /companies/{company_id}/courses': (
+        'GET',
+        {200, 404},
+        lambda ctx, i: {
+            'url': f'/companies/{ctx.pick("companies", i)}/courses',
+        },
+    ),
+    'GET /courses': (
+        'GET',
+        {200},
+        lambda ctx, i: {'url': '/courses', 'params': {'limit': 50}},
+    ),
+    'GET /courses/search': (
+        'GET',
+        {200},
+        lambda ctx, i: {
+            'url': '/courses/search',
+            'params': {'q': TOPICS[i % len(TOPICS)], 'limit': 20},
+        },
+    ),
+    'GET /courses/{curso_id}': (
+        'GET',
+        {200},
+        lambda ctx, i: {'url': f'/courses/{ctx.pick("courses", i)}'},
+    ),
+    'POST /enrollments': (
+        'POST',
+        {201, 409},
+        lambda ctx, i: {'url': '/enrollments', 'json': _enrollment(ctx, i)},
+    ),
+    'POST /enrollments/bulk': (
+        'POST',
+        {200},
+        lambda ctx, i: {
+            'url': '/enrollments/bulk',
+            'json': {
+                'items': [
+                    _enrollment(ctx, i * BULK_SIZE + j)
+                    for j in range(BULK_SIZE)
+                ]
+            },
+        },
+    ),
+    'GET /companies/{company_id}/stats': (
+        'GET',
+        {200},
+        lambda ctx, i: {
+            'url': f'/companies/{ctx.pick("companies", i)}/stats',
+        },
+    ),
+    'GET /students/{student_id}/recommendations': (
+        'GET',
+        {200},
+        lambda ctx, i: {
+            'url': f'/students/{ctx.pick("users", i)}/recommendations',
+        },
+    ),
+    'GET /students/my-courses': (
+        'GET',
+        {200},
+        lambda ctx, i: {
+            'url': '/students/my-courses',
+            'params': {'user_id': ctx.pick('users', i)},
+        },
+    ),
+    'GET /export/{table}': (
+        'GET',
+        {200},
+        lambda ctx, i: {
+            'url': '/export/courses',
+            'params': {'format': ('ndjson', 'csv')[i % 2]},
+            'headers': {'X-Export-Key': ctx.export_key},
+        },
+    ),
+    'GET /metrics': ('GET', {200}, lambda ctx, i: {'url': '/metrics'}),
+    'DELETE /companies/my-courses/{course_id}': (
+        'DELETE',
+        {204},
+        _delete_course,
+    ),
+}
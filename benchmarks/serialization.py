@@ -0,0 +1,87 @@
+"""Custo de serializar uma listagem de cursos em cada caminho da API.
+
+python -m benchmarks.serialization --courses 10000
+"""
+
+import argparse
+import json
+import time
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+
+from fast_tech.models import Curso
+from fast_tech.schema import CursoEmpresaOut
+
+
+def _timed(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def run(courses: int, repeat: int) -> dict:
+    entities = [
+        Curso(
+            id=i,
+            name=f'Curso {i}',
+            description='Descrição do curso ' * 4,
+            youtube_link=f'https://youtu.be/c{i}',
+            company_id=i % 100 + 1,
+        )
+        for i in range(1, courses + 1)
+    ]
+    rows = [
+        {
+            'id': curso.id,
+            'name': curso.name,
+            'description': curso.description,
+            'youtube_link': curso.youtube_link,
+        }
+        for curso in entities
+    ]
+    adapter = TypeAdapter(List[CursoEmpresaOut])
+    # Validação só para medir o encoder padrão sobre modelos já prontos
+    models = adapter.validate_python(rows)
+
+    return {
+        'jsonable_encoder + json (ORM)': _timed(
+            lambda: json.dumps(jsonable_encoder(entities)).encode(), repeat
+        ),
+        'jsonable_encoder + json (modelos)': _timed(
+            lambda: json.dumps(jsonable_encoder(models)).encode(), repeat
+        ),
+        'response_model + orjson (ORM)': _timed(
+            lambda: ORJSONResponse(
+                adapter.dump_python(
+                    adapter.validate_python(entities, from_attributes=True),
+                    mode='json',
+                )
+            ).body,
+            repeat,
+        ),
+        'TypeAdapter.dump_json (linhas)': _timed(
+            lambda: adapter.dump_json(adapter.validate_python(rows)), repeat
+        ),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.serialization')
+    parser.add_argument('--courses', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = run(args.courses, args.repeat)
+    baseline = next(iter(results.values()))
+    for name, elapsed in results.items():
+        print(f'{name:36} {elapsed:8.1f} ms  {baseline / elapsed:5.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from collections import deque
+
+from fast_tech.settings import settings
+
+
+class AdmissionRejectedError(Exception):
+    pass
+
+
+class AdmissionLimiter:
+    """Limita quantas requisições de um grupo rodam ao mesmo tempo.
+
+    Até `limit` entram direto; as próximas esperam numa fila de no máximo
+    `max_queue` lugares e por até `queue_timeout` segundos. Fila cheia ou
+    espera estourada viram `AdmissionRejectedError` na hora, em vez de
+    acumular requisições que vão expirar juntas.
+    """
+
+    def __init__(self, limit: int, max_queue: int, queue_timeout: float):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._active = 0
+        self._waiters = deque()
+        self._admitted = 0
+        self._shed = 0
+
+    async def acquire(self) -> float:
+        """Ocupa uma vaga e devolve quanto tempo esperou na fila."""
+        if self._active < self.limit and not self._waiters:
+            self._active += 1
+            self._admitted += 1
+            return 0.0
+        if len(self._waiters) >= self.max_queue:
+            self._shed += 1
+            raise AdmissionRejectedError('Fila de admissão cheia')
+
+        started = time.perf_counter()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # A vaga chegou junto com o cancelamento: devolve
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(exc, TimeoutError):
+                self._shed += 1
+                raise AdmissionRejectedError('Tempo de fila esgotado') from exc
+            raise
+        self._admitted += 1
+        return time.perf_counter() - started
+
+    def release(self):
+        # Passa a vaga direto para o próximo da fila, sem liberar o contador
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def stats(self) -> dict:
+        return {
+            'active': self._active,
+            'queued': len(self._waiters),
+            'admitted': self._admitted,
+            'shed': self._shed,
+        }
+
+
+# Rotas que pagam bcrypt; o resto é dividido entre leituras e escritas
+AUTH_PATHS = {
+    '/login',
+    '/companyLogin',
+    '/registerStudent',
+    '/registerStudent/bulk',
+    '/registerCompany',
+    '/registerCompany/bulk',
+}
+SAFE_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+
+def route_group(method: str, path: str) -> str | None:
+    # Métricas ficam de fora: precisam responder justamente na sobrecarga;
+    # preflights de CORS são respondidos pelo middleware sem tocar no banco
+    if method == 'OPTIONS' or path.startswith('/metrics'):
+        return None
+    if path in AUTH_PATHS:
+        return 'auth'
+    return 'reads' if method in SAFE_METHODS else 'writes'
+
+
+limiters = {
+    group: AdmissionLimiter(limit, max_queue, settings.ADMISSION_QUEUE_TIMEOUT)
+    for group, (limit, max_queue) in settings.ADMISSION_LIMITS.items()
+}
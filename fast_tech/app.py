@@ -1,75 +1,355 @@
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
 from http import HTTPStatus
-from typing import List
-
-from fastapi import Depends, FastAPI, HTTPException, Response, status
+from typing import Dict, List, Literal, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    FastAPI,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from passlib.context import CryptContext
-from passlib.hash import bcrypt
-from sqlalchemy.orm import Session
-
-from fast_tech.db import Base, SessionLocal, engine
-from fast_tech.models import Company, Curso, Inscricao, User
+from fastapi.responses import (
+    ORJSONResponse,
+    PlainTextResponse,
+    StreamingResponse,
+)
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fast_tech.admission import (
+    SAFE_METHODS,
+    AdmissionRejectedError,
+    limiters,
+    route_group,
+)
+from fast_tech.cache import (
+    COURSES_SCOPE,
+    bump_scope_versions,
+    catalog_cache,
+    company_scope,
+    course_scope,
+    scope_version,
+)
+from fast_tech.course_import import import_courses, read_rows
+from fast_tech.db import (
+    AsyncReadSessionLocal,
+    AsyncSessionLocal,
+    async_engine,
+    async_read_engine,
+)
+from fast_tech.enrollments import (
+    bump_enrollment_counts,
+    enroll_many,
+    enrollment_writer,
+    insert_enrollments,
+)
+from fast_tech.export import (
+    EXPORT_TABLES,
+    MEDIA_TYPES,
+    export_columns,
+    stream_export,
+)
+from fast_tech.hashing import HasherBusyError, password_hasher
+from fast_tech.metrics import (
+    RequestStats,
+    current_request,
+    metrics,
+    server_timing,
+)
+from fast_tech.models import Company, Curso, Inscricao, RefreshToken, User
+from fast_tech.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    Page,
+    paginate,
+)
+from fast_tech.recommendations import recommend_courses, record_enrollments
+from fast_tech.refresh_tokens import (
+    hash_refresh_token,
+    issue_refresh_token,
+    revoke_family,
+    rotate_refresh_token,
+)
+from fast_tech.registration import (
+    COMPANY_UNIQUE_FIELDS,
+    USER_UNIQUE_FIELDS,
+    register_many,
+)
 from fast_tech.schema import (
+    CacheStatsOut,
+    CompanyBulkCreate,
     CompanyLogin,
     CompanyOut,
     CompanySchema,
+    CompanyStatsOut,
     CursoCreate,
+    CursoCreateOut,
     CursoEmpresaOut,
+    CursoImportOut,
+    CursoOut,
+    InscricaoBulkCreate,
+    InscricaoBulkOut,
     InscricaoCreate,
+    InscricaoOut,
     LoginResponse,
+    PasswordHasherStatsOut,
+    RecommendationOut,
+    RefreshTokenIn,
+    RegistrationBulkOut,
+    TokenOut,
+    UserBulkCreate,
     UserLogin,
     UserPublic,
     UserSchema,
 )
+from fast_tech.search import search_courses
 from fast_tech.security import (
     create_access_token,
     get_current_company,
+    require_export_key,
+    token_cache,
 )
+from fast_tech.settings import settings
+from fast_tech.startup import prepare_schema, warm_pool
+from fast_tech.throttle import login_throttle
 
-app = FastAPI()
+logger = logging.getLogger('fast_tech')
 
+router = APIRouter()
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=['http://localhost:5173'],
-    allow_credentials=True,
-    allow_methods=['*'],
-    allow_headers=['*'],
-)
+# Colunas das respostas de listagem: nada além do que o schema devolve
+USER_PUBLIC_COLUMNS = (User.id, User.username, User.email, User.phone)
+COURSE_COLUMNS = (Curso.id, Curso.name, Curso.description, Curso.youtube_link)
+
+user_page_adapter = TypeAdapter(Page[UserPublic])
+course_page_adapter = TypeAdapter(Page[CursoEmpresaOut])
+course_list_adapter = TypeAdapter(List[CursoEmpresaOut])
+course_adapter = TypeAdapter(CursoOut)
+company_stats_adapter = TypeAdapter(CompanyStatsOut)
+recommendation_list_adapter = TypeAdapter(List[RecommendationOut])
+
+
+def hasher_busy_handler(request, exc):
+    return ORJSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={'detail': 'Servidor ocupado, tente novamente.'},
+        headers={'Retry-After': '1'},
+    )
+
+
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else 'desconhecido'
+
+
+async def check_login_throttle(scope: str, username: str, ip: str):
+    # Recusa antes de tocar no banco ou no bcrypt
+    wait = await login_throttle.check(scope, username, ip)
+    if wait:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail='Muitas tentativas de login. Tente novamente mais tarde.',
+            headers={'Retry-After': str(math.ceil(wait))},
+        )
 
-Base.metadata.drop_all(bind=engine)
-Base.metadata.create_all(bind=engine)
-pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
 
+TOKEN_SUBJECTS = {'student': User, 'company': Company}
 
-def get_db():
-    db = SessionLocal()
+
+def access_token_for(role: str, subject) -> str:
+    return create_access_token({
+        'sub': subject.username,
+        'role': role,
+        'id': subject.id,
+    })
+
+
+async def issue_session_tokens(db, role: str, subject) -> dict:
+    refresh_token = issue_refresh_token(db, role, subject.id)
+    await db.commit()
+    return {
+        'token': access_token_for(role, subject),
+        'refresh_token': refresh_token,
+    }
+
+
+READ_YOUR_WRITES_COOKIE = 'last_write'
+
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def wrote_recently(request: Request) -> bool:
     try:
+        last_write = float(request.cookies[READ_YOUR_WRITES_COOKIE])
+    except (KeyError, ValueError):
+        return False
+    return time.time() - last_write < settings.READ_YOUR_WRITES_SECONDS
+
+
+async def get_read_db(request: Request):
+    # Quem acabou de escrever lê do primário: uma réplica pode ainda não
+    # ter recebido o commit
+    factory = (
+        AsyncSessionLocal if wrote_recently(request) else AsyncReadSessionLocal
+    )
+    async with factory() as db:
         yield db
+
+
+def json_response(adapter, data) -> Response:
+    # Dados vindos de linhas (dicts), validados e serializados uma vez só
+    # pelo TypeAdapter, sem a segunda validação do response_model
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(data)),
+        media_type='application/json',
+    )
+
+
+def all_courses_query():
+    return select(*COURSE_COLUMNS).join(Company)
+
+
+async def cached_course_page(db, scope, stmt, limit, after):
+    # Página do catálogo já serializada; None quando a primeira página é vazia
+    key = (scope, await scope_version(db, scope), limit, after)
+    if (body := catalog_cache.get(key)) is not None:
+        return body
+
+    page = await paginate(db, stmt, Curso.id, limit, after)
+    if not page['items'] and after is None:
+        return None
+
+    body = course_page_adapter.dump_json(
+        course_page_adapter.validate_python(page)
+    )
+    catalog_cache.set(key, body)
+    return body
+
+
+async def instrument_request(request: Request, call_next):
+    stats = RequestStats()
+    token = current_request.set(stats)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        current_request.reset(token)
+    elapsed = time.perf_counter() - started
+
+    route = request.scope.get('route')
+    metrics.record_request(
+        (request.method, getattr(route, 'path', 'unmatched')), elapsed, stats
+    )
+    response.headers['Server-Timing'] = server_timing(stats, elapsed)
+    return response
+
+
+async def admission_control(request: Request, call_next):
+    group = route_group(request.method, request.url.path)
+    if not settings.ADMISSION_CONTROL or group not in limiters:
+        return await call_next(request)
+
+    limiter = limiters[group]
+    try:
+        waited = await limiter.acquire()
+    except AdmissionRejectedError:
+        return ORJSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={'detail': 'Servidor ocupado, tente novamente.'},
+            headers={'Retry-After': str(settings.ADMISSION_RETRY_AFTER)},
+        )
+    metrics.record_admission(group, waited)
+    try:
+        return await call_next(request)
     finally:
-        db.close()
+        limiter.release()
+
+
+async def remember_writes(request: Request, call_next):
+    response = await call_next(request)
+    if (
+        request.method not in SAFE_METHODS
+        and response.status_code < status.HTTP_400_BAD_REQUEST
+        and settings.READ_YOUR_WRITES_SECONDS > 0
+    ):
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            str(time.time()),
+            max_age=int(settings.READ_YOUR_WRITES_SECONDS) + 1,
+            httponly=True,
+            samesite='lax',
+        )
+    return response
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    timings = {}
+
+    started = time.perf_counter()
+    await prepare_schema(settings.SCHEMA_MODE)
+    timings['schema'] = time.perf_counter() - started
+
+    step = time.perf_counter()
+    await warm_pool(settings.DB_POOL_WARMUP)
+    timings['pool'] = time.perf_counter() - step
 
+    step = time.perf_counter()
+    async with AsyncReadSessionLocal() as db:
+        await cached_course_page(
+            db, COURSES_SCOPE, all_courses_query(), DEFAULT_PAGE_SIZE, None
+        )
+    timings['catalog_cache'] = time.perf_counter() - step
+
+    timings['total'] = time.perf_counter() - started
+    app.state.startup_timings = timings
+    logger.info(
+        'Startup em %.1f ms (%s)',
+        timings['total'] * 1000,
+        ', '.join(f'{k}={v * 1000:.1f}ms' for k, v in timings.items()),
+    )
+
+    if settings.ENROLLMENT_GROUP_COMMIT:
+        enrollment_writer.start()
 
-def hash_password(password: str) -> str:
-    return bcrypt.hash(password)
+    yield
 
+    await enrollment_writer.stop()
+    password_hasher.shutdown(wait=False)
+    await async_engine.dispose()
+    await async_read_engine.dispose()
 
-@app.post(
+
+@router.post(
     '/registerStudent',
     status_code=HTTPStatus.CREATED,
     response_model=UserPublic,
 )
-def create_user(
+async def create_user(
     user: UserSchema,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    if db.query(User).filter(User.username == user.username).first():
+    if await db.scalar(select(User.id).where(User.username == user.username)):
         raise HTTPException(status_code=400, detail='Username já existe')
 
-    if db.query(User).filter(User.email == user.email).first():
+    if await db.scalar(select(User.id).where(User.email == user.email)):
         raise HTTPException(status_code=400, detail='Email já existe')
 
-    hashed_password = pwd_context.hash(user.password)
+    # Sem transação aberta durante o bcrypt (ver register_many)
+    await db.rollback()
+    hashed_password = await password_hasher.hash(user.password)
 
     db_user = User(
         name=user.name,
@@ -79,59 +359,84 @@ def create_user(
         phone=user.phone,
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
 
     return db_user
 
 
-@app.get('/usuarios', response_model=List[UserPublic])
-def listar_usuarios(db: Session = Depends(get_db)):
-    usuarios = db.query(User).all()
-    return usuarios
+def bulk_summary(results):
+    created = sum(
+        1 for result in results if result['status_code'] == HTTPStatus.CREATED
+    )
+    return {
+        'created': created,
+        'failed': len(results) - created,
+        'results': results,
+    }
+
+
+@router.post('/registerStudent/bulk', response_model=RegistrationBulkOut)
+async def create_users_bulk(
+    payload: UserBulkCreate, db: AsyncSession = Depends(get_db)
+):
+    results = await register_many(db, User, payload.items, USER_UNIQUE_FIELDS)
+    return bulk_summary(results)
+
+
+@router.get('/usuarios', response_model=Page[UserPublic])
+async def listar_usuarios(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    page = await paginate(
+        db, select(*USER_PUBLIC_COLUMNS), User.id, limit, after
+    )
+    return json_response(user_page_adapter, page)
 
 
-@app.post(
+@router.post(
     '/login',
     status_code=HTTPStatus.OK,
     response_model=LoginResponse,
     responses={
-        404: {'description': 'Usuário não encontrado'},
         400: {'description': 'Credenciais inválidas'},
+        429: {'description': 'Muitas tentativas de login'},
         500: {'description': 'Erro interno no servidor'},
     },
 )
 async def login_student(
     user: UserLogin,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db),
 ):
+    ip = client_ip(request)
+    await check_login_throttle('student', user.username, ip)
     try:
-        db_user = db.query(User).filter(User.username == user.username).first()
-
-        if not db_user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail='Usuário não encontrado',
-            )
+        db_user = await db.scalar(
+            select(User).where(User.username == user.username)
+        )
 
-        if not pwd_context.verify(user.password, db_user.password):
+        if not await password_hasher.verify_or_dummy(
+            user.password, db_user.password if db_user else None
+        ):
+            await login_throttle.failed('student', user.username, ip)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail='Credenciais inválidas',
             )
-        access_token = create_access_token({
-            'sub': db_user.username,
-            'role': 'student',
-            'id': db_user.id,
-        })
+        await login_throttle.succeeded('student', user.username)
         return {
             'message': 'Login bem sucedido',
             'id': db_user.id,
             'username': db_user.username,
             'email': db_user.email,
-            'token': access_token,
+            **await issue_session_tokens(db, 'student', db_user),
         }
 
+    except (HTTPException, HasherBusyError):
+        raise
     except Exception as e:
         print(f'Erro durante o login: {str(e)}')
         raise HTTPException(
@@ -140,25 +445,31 @@ async def login_student(
         )
 
 
-@app.post(
+@router.post(
     '/registerCompany',
     status_code=HTTPStatus.CREATED,
     response_model=CompanyOut,
 )
-def create_company(
+async def create_company(
     company: CompanySchema,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    if db.query(Company).filter(Company.username == company.username).first():
+    if await db.scalar(
+        select(Company.id).where(Company.username == company.username)
+    ):
         raise HTTPException(status_code=400, detail='Username já existe')
 
-    if db.query(Company).filter(Company.email == company.email).first():
+    if await db.scalar(
+        select(Company.id).where(Company.email == company.email)
+    ):
         raise HTTPException(status_code=400, detail='Email já existe')
 
-    if db.query(Company).filter(Company.cnpj == company.cnpj).first():
+    if await db.scalar(select(Company.id).where(Company.cnpj == company.cnpj)):
         raise HTTPException(status_code=400, detail='CNPJ já cadastrado')
 
-    hashed_password = pwd_context.hash(company.password)
+    # Sem transação aberta durante o bcrypt (ver register_many)
+    await db.rollback()
+    hashed_password = await password_hasher.hash(company.password)
 
     db_company = Company(
         cnpj=company.cnpj,
@@ -168,49 +479,63 @@ def create_company(
         phone=company.phone,
     )
     db.add(db_company)
-    db.commit()
-    db.refresh(db_company)
+    await db.commit()
+    await db.refresh(db_company)
 
     return db_company
 
 
-@app.post(
+@router.post('/registerCompany/bulk', response_model=RegistrationBulkOut)
+async def create_companies_bulk(
+    payload: CompanyBulkCreate, db: AsyncSession = Depends(get_db)
+):
+    results = await register_many(
+        db, Company, payload.items, COMPANY_UNIQUE_FIELDS
+    )
+    return bulk_summary(results)
+
+
+@router.post(
     '/companyLogin',
     status_code=HTTPStatus.OK,
     response_model=LoginResponse,
     responses={
-        404: {'description': 'Usuário não encontrado'},
         400: {'description': 'Credenciais inválidas'},
+        429: {'description': 'Muitas tentativas de login'},
         500: {'description': 'Erro interno no servidor'},
     },
 )
 async def login_company(
     user: CompanyLogin,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db),
 ):
+    ip = client_ip(request)
+    await check_login_throttle('company', user.username, ip)
     try:
-        db_company = (
-            db.query(Company).filter(Company.username == user.username).first()
+        db_company = await db.scalar(
+            select(Company).where(Company.username == user.username)
         )
 
-        if not db_company:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail='Usuário não encontrado',
-            )
-
-        if not pwd_context.verify(user.password, db_company.password):
+        if not await password_hasher.verify_or_dummy(
+            user.password, db_company.password if db_company else None
+        ):
+            await login_throttle.failed('company', user.username, ip)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail='Credenciais inválidas',
             )
+        await login_throttle.succeeded('company', user.username)
 
         return {
             'message': 'Login bem-sucedido',
             'id': db_company.id,
             'username': db_company.username,
             'email': db_company.email,
+            **await issue_session_tokens(db, 'company', db_company),
         }
+    except (HTTPException, HasherBusyError):
+        raise
     except Exception as e:
         print(f'Erro durante o login: {str(e)}')
         raise HTTPException(
@@ -219,9 +544,63 @@ async def login_company(
         )
 
 
-@app.post('/createCourses')
-def criar_curso(curso: CursoCreate, db: Session = Depends(get_db)):
-    empresa = db.query(Company).filter(Company.id == curso.company_id).first()
+@router.post(
+    '/token/refresh',
+    response_model=TokenOut,
+    responses={401: {'description': 'Refresh token inválido ou expirado'}},
+)
+async def refresh_access_token(
+    payload: RefreshTokenIn, db: AsyncSession = Depends(get_db)
+):
+    # SHA-256 e busca pelo índice único: nada de bcrypt na renovação
+    rotated = await rotate_refresh_token(db, payload.refresh_token)
+    subject = None
+    if rotated is not None:
+        stored, refresh_token = rotated
+        subject = await db.get(TOKEN_SUBJECTS[stored.role], stored.subject_id)
+
+    if subject is None:
+        if rotated is None:
+            # Grava a revogação da família quando o token foi reutilizado
+            await db.commit()
+        else:
+            await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail='Refresh token inválido ou expirado.',
+        )
+
+    await db.commit()
+    return {
+        'access_token': access_token_for(stored.role, subject),
+        'refresh_token': refresh_token,
+    }
+
+
+@router.post(
+    '/token/revoke',
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
+)
+async def revoke_refresh_token(
+    payload: RefreshTokenIn, db: AsyncSession = Depends(get_db)
+):
+    # Logout: encerra a sessão inteira (todos os tokens da rotação)
+    family = await db.scalar(
+        select(RefreshToken.family).where(
+            RefreshToken.token_hash
+            == hash_refresh_token(payload.refresh_token)
+        )
+    )
+    if family is not None:
+        await revoke_family(db, family)
+        await db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post('/createCourses', response_model=CursoCreateOut)
+async def criar_curso(curso: CursoCreate, db: AsyncSession = Depends(get_db)):
+    empresa = await db.get(Company, curso.company_id)
 
     if not empresa:
         print(f'Empresa com ID {curso.company_id} não encontrada')
@@ -238,107 +617,307 @@ def criar_curso(curso: CursoCreate, db: Session = Depends(get_db)):
     )
 
     db.add(novo_curso)
-    db.commit()
-    db.refresh(novo_curso)
+    await bump_scope_versions(
+        db, COURSES_SCOPE, company_scope(curso.company_id)
+    )
+    await db.commit()
+    await db.refresh(novo_curso)
 
     return {'message': 'Curso criado com sucesso', 'company_id': novo_curso.id}
 
 
-@app.get(
-    '/companies/{company_id}/courses', response_model=List[CursoEmpresaOut]
+@router.post('/createCourses/bulk', response_model=CursoImportOut)
+async def importar_cursos(
+    file: UploadFile,
+    format: Optional[Literal['csv', 'ndjson']] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    if format is None:
+        format = 'csv' if (file.filename or '').endswith('.csv') else 'ndjson'
+
+    return await import_courses(db, read_rows(file.file, format))
+
+
+@router.get(
+    '/companies/{company_id}/courses', response_model=Page[CursoEmpresaOut]
 )
-def list_company_courses(company_id: int, db: Session = Depends(get_db)):
-    courses = db.query(Curso).filter(Curso.company_id == company_id).all()
+async def list_company_courses(
+    company_id: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    body = await cached_course_page(
+        db,
+        company_scope(company_id),
+        select(*COURSE_COLUMNS).where(Curso.company_id == company_id),
+        limit,
+        after,
+    )
 
-    if not courses:
+    if body is None:
         raise HTTPException(
             status_code=404, detail='No courses found for this company.'
         )
 
-    return courses
+    return Response(content=body, media_type='application/json')
 
 
-@app.get('/courses', response_model=List[CursoEmpresaOut])
-def list_all_courses(db: Session = Depends(get_db)):
-    courses = db.query(Curso).join(Company).all()
+@router.get('/courses', response_model=Page[CursoEmpresaOut])
+async def list_all_courses(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    body = await cached_course_page(
+        db, COURSES_SCOPE, all_courses_query(), limit, after
+    )
 
-    if not courses:
+    if body is None:
         raise HTTPException(status_code=404, detail='No courses found')
 
-    return courses
+    return Response(content=body, media_type='application/json')
 
 
-@app.get('/courses/{curso_id}')
-def get_course(curso_id: int, db: Session = Depends(get_db)):
-    curso = db.query(Curso).filter(Curso.id == curso_id).first()
-    if not curso:
+@router.get('/courses/search', response_model=Page[CursoEmpresaOut])
+async def search_courses_endpoint(
+    q: str = Query(min_length=1),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    return await search_courses(db, q, limit, after)
+
+
+@router.get('/courses/{curso_id}', response_model=CursoOut)
+async def get_course(curso_id: int, db: AsyncSession = Depends(get_read_db)):
+    scope = course_scope(curso_id)
+    key = (scope, await scope_version(db, scope))
+    if (body := catalog_cache.get(key)) is not None:
+        return Response(content=body, media_type='application/json')
+
+    row = (
+        await db.execute(
+            select(*COURSE_COLUMNS, Curso.company_id).where(
+                Curso.id == curso_id
+            )
+        )
+    ).first()
+    if row is None:
         raise HTTPException(status_code=404, detail='Curso não encontrado.')
-    return curso
+
+    body = course_adapter.dump_json(
+        course_adapter.validate_python(row._asdict())
+    )
+    catalog_cache.set(key, body)
+    return Response(content=body, media_type='application/json')
 
 
-@app.post('/enrollments', status_code=status.HTTP_201_CREATED)
-def create_enrollment(
-    inscricao: InscricaoCreate, db: Session = Depends(get_db)
+@router.post(
+    '/enrollments',
+    status_code=status.HTTP_201_CREATED,
+    response_model=InscricaoOut,
+)
+async def create_enrollment(
+    inscricao: InscricaoCreate, db: AsyncSession = Depends(get_db)
 ):
-    curso = db.query(Curso).filter(Curso.id == inscricao.course_id).first()
+    if settings.ENROLLMENT_GROUP_COMMIT:
+        result = await enrollment_writer.submit(
+            inscricao.student_id, inscricao.course_id
+        )
+        if result['status_code'] != HTTPStatus.CREATED:
+            raise HTTPException(
+                status_code=result['status_code'], detail=result['detail']
+            )
+        return {
+            'message': result['detail'],
+            'enrollment_id': result['enrollment_id'],
+        }
+
+    curso = await db.get(Curso, inscricao.course_id)
     if not curso:
         raise HTTPException(status_code=404, detail='Curso não encontrado.')
 
-    aluno = db.query(User).filter(User.id == inscricao.student_id).first()
+    aluno = await db.get(User, inscricao.student_id)
     if not aluno:
         raise HTTPException(status_code=404, detail='Aluno não encontrado.')
 
-    ja_inscrito = (
-        db.query(Inscricao)
-        .filter(
-            Inscricao.student_id == inscricao.student_id,
-            Inscricao.course_id == inscricao.course_id,
-        )
-        .first()
+    # O índice único decide a duplicidade: sem corrida entre checar e inserir
+    enrollment_id = await db.scalar(
+        insert_enrollments(db)
+        .values(student_id=inscricao.student_id, course_id=inscricao.course_id)
+        .returning(Inscricao.id)
     )
 
-    if ja_inscrito:
+    if enrollment_id is None:
         raise HTTPException(
             status_code=409, detail='Aluno já está inscrito nesse curso.'
         )
 
-    nova_inscricao = Inscricao(
-        student_id=inscricao.student_id, course_id=inscricao.course_id
-    )
-
-    db.add(nova_inscricao)
-    db.commit()
-    db.refresh(nova_inscricao)
+    await bump_enrollment_counts(db, [inscricao.course_id])
+    await record_enrollments(db, [(inscricao.student_id, inscricao.course_id)])
+    await db.commit()
 
     return {
         'message': 'Inscrição realizada com sucesso',
-        'enrollment_id': nova_inscricao.id,
+        'enrollment_id': enrollment_id,
     }
 
 
-@app.get('/students/my-courses', response_model=List[CursoEmpresaOut])
-def listar_cursos_aluno(user_id: int, db: Session = Depends(get_db)):
-    inscricoes = (
-        db.query(Inscricao).filter(Inscricao.student_id == user_id).all()
-    )
+@router.post('/enrollments/bulk', response_model=InscricaoBulkOut)
+async def create_enrollments_bulk(
+    payload: InscricaoBulkCreate, db: AsyncSession = Depends(get_db)
+):
+    pairs = [(item.student_id, item.course_id) for item in payload.items]
+    results = await enroll_many(db, pairs)
+    await db.commit()
+
+    return bulk_summary(results)
 
-    if not inscricoes:
-        return []
 
-    cursos_ids = [inscricao.course_id for inscricao in inscricoes]
-    cursos = db.query(Curso).filter(Curso.id.in_(cursos_ids)).all()
+@router.get('/companies/{company_id}/stats', response_model=CompanyStatsOut)
+async def company_stats(
+    company_id: int, db: AsyncSession = Depends(get_read_db)
+):
+    # Lê só os contadores dos cursos (índice company_id, id): o custo não
+    # depende do número de inscrições
+    rows = (
+        await db.execute(
+            select(Curso.id, Curso.name, Curso.enrollment_count)
+            .where(Curso.company_id == company_id)
+            .order_by(Curso.id)
+        )
+    ).all()
 
-    if not cursos:
+    if not rows and not await db.get(Company, company_id):
         raise HTTPException(
-            status_code=404, detail='Nenhum curso encontrado para o aluno.'
+            status_code=404,
+            detail=f'Empresa com ID {company_id} não encontrada',
         )
 
-    return cursos
+    return json_response(
+        company_stats_adapter,
+        {
+            'company_id': company_id,
+            'total_courses': len(rows),
+            'total_enrollments': sum(row.enrollment_count for row in rows),
+            'courses': [row._asdict() for row in rows],
+        },
+    )
+
+
+@router.get('/students/my-courses', response_model=List[CursoEmpresaOut])
+async def listar_cursos_aluno(
+    user_id: int, db: AsyncSession = Depends(get_read_db)
+):
+    # Uma consulta só: o índice (student_id, course_id) das inscrições leva
+    # direto às linhas de cursos, lidas pela chave primária
+    rows = await db.execute(
+        select(*COURSE_COLUMNS)
+        .join(Inscricao, Inscricao.course_id == Curso.id)
+        .where(Inscricao.student_id == user_id)
+    )
+
+    return json_response(course_list_adapter, [row._asdict() for row in rows])
+
+
+@router.get(
+    '/students/{student_id}/recommendations',
+    response_model=List[RecommendationOut],
+)
+async def recomendar_cursos(
+    student_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+):
+    if not await db.get(User, student_id):
+        raise HTTPException(status_code=404, detail='Aluno não encontrado.')
+
+    return json_response(
+        recommendation_list_adapter,
+        await recommend_courses(db, student_id, limit),
+    )
+
+
+@router.get(
+    '/export/{table}',
+    response_class=StreamingResponse,
+    dependencies=[Depends(require_export_key)],
+)
+async def export_table(
+    table: Literal['users', 'companies', 'courses', 'enrollments'],
+    format: Literal['ndjson', 'csv'] = 'ndjson',
+    columns: Optional[str] = None,
+):
+    model = EXPORT_TABLES[table]
+    selected = export_columns(model, columns)
+
+    return StreamingResponse(
+        stream_export(model, selected, format),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            'Content-Disposition': f'attachment; filename={table}.{format}'
+        },
+    )
+
+
+@router.get('/metrics', response_class=PlainTextResponse)
+def prometheus_metrics():
+    hasher = password_hasher.stats()
+    gauges = {
+        'password_hasher_in_flight': hasher['in_flight'],
+        'password_hasher_queue_depth': hasher['queue_depth'],
+        'password_hasher_completed': hasher['completed'],
+        'password_hasher_rejected': hasher['rejected'],
+        'password_hasher_latency_p99_ms': hasher['latency_ms']['p99'],
+    }
+    for group, limiter in limiters.items():
+        for name, value in limiter.stats().items():
+            gauges[f'admission_{group}_{name}'] = value
+    for name, value in enrollment_writer.stats().items():
+        gauges[f'enrollment_writer_{name}'] = value
+    for prefix, cache in (
+        ('catalog_cache', catalog_cache),
+        ('token_cache', token_cache),
+    ):
+        cache_stats = cache.stats()
+        for name in ('size', 'hits', 'misses', 'evictions'):
+            gauges[f'{prefix}_{name}'] = cache_stats[name]
+
+    return PlainTextResponse(
+        metrics.render(gauges), media_type='text/plain; version=0.0.4'
+    )
 
 
-@app.delete(
+@router.get('/metrics/startup', response_model=Dict[str, float])
+def startup_stats(request: Request):
+    return {
+        name: seconds * 1000
+        for name, seconds in getattr(
+            request.app.state, 'startup_timings', {}
+        ).items()
+    }
+
+
+@router.get('/metrics/password-hasher', response_model=PasswordHasherStatsOut)
+def password_hasher_stats():
+    return password_hasher.stats()
+
+
+@router.get('/metrics/token-cache', response_model=CacheStatsOut)
+def token_cache_stats():
+    return token_cache.stats()
+
+
+@router.get('/metrics/catalog-cache', response_model=CacheStatsOut)
+def catalog_cache_stats():
+    return catalog_cache.stats()
+
+
+@router.delete(
     '/companies/my-courses/{course_id}',
     status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
     responses={
         204: {'description': 'Curso excluído com sucesso'},
         401: {'description': 'Não autenticado'},
@@ -349,33 +928,57 @@ def listar_cursos_aluno(user_id: int, db: Session = Depends(get_db)):
         },
     },
 )
-@app.delete(
-    '/companies/my-courses/{course_id}',
-    status_code=status.HTTP_204_NO_CONTENT,
-    responses={
-        204: {'description': 'Curso excluído com sucesso'},
-    },
-)
-def delete_course(
+async def delete_course(
     course_id: int,
     current_company=Depends(get_current_company),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    curso = db.query(Curso).filter(Curso.id == course_id).first()
+    curso = await db.get(Curso, course_id)
     if not curso:
         raise HTTPException(status_code=404, detail='Curso não encontrado.')
 
-    if curso.company_id != current_company:
+    if curso.company_id != current_company['id']:
         raise HTTPException(
             status_code=403, detail='Curso não pertence à empresa logada.'
         )
 
-    if db.query(Inscricao).filter(Inscricao.course_id == course_id).first():
+    if curso.enrollment_count:
         raise HTTPException(
             status_code=409,
             detail='Curso possui alunos inscritos e não pode ser excluído.',
         )
 
-    db.delete(curso)
-    db.commit()
+    await db.delete(curso)
+    await bump_scope_versions(
+        db,
+        COURSES_SCOPE,
+        company_scope(curso.company_id),
+        course_scope(course_id),
+    )
+    await db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+def create_app() -> FastAPI:
+    # orjson serializa os dicts que o response_model já validou
+    app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+    # O último registrado é o mais externo: CORS vale também para os 503 da
+    # admissão, e as requisições recusadas entram nas métricas
+    app.middleware('http')(remember_writes)
+    app.middleware('http')(admission_control)
+    app.middleware('http')(instrument_request)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=['http://localhost:5173'],
+        allow_credentials=True,
+        allow_methods=['*'],
+        allow_headers=['*'],
+    )
+    app.add_exception_handler(HasherBusyError, hasher_busy_handler)
+    app.include_router(router)
+
+    return app
+
+
+app = create_app()
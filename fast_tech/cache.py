@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import select
+
+from fast_tech.db import dialect_insert
+from fast_tech.models import CatalogVersion
+from fast_tech.settings import settings
+
+COURSES_SCOPE = 'courses'
+
+
+def company_scope(company_id: int) -> str:
+    return f'company:{company_id}'
+
+
+def course_scope(course_id: int) -> str:
+    return f'course:{course_id}'
+
+
+class LRUCache:
+    """Cache LRU limitado por tamanho, com TTL opcional (global ou por item).
+
+    No catálogo as chaves começam por `(escopo, versão)`: quando a versão do
+    escopo muda no banco, as entradas antigas deixam de ser encontradas e
+    saem pelo LRU.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        ttl = ttl if ttl is not None else self.ttl
+        if ttl is not None and ttl <= 0:
+            return
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def discard_scopes(self, *scopes: str):
+        with self._lock:
+            for key in [key for key in self._data if key[0] in scopes]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+            }
+
+
+async def scope_version(db, scope: str) -> int:
+    version = await db.scalar(
+        select(CatalogVersion.version).where(CatalogVersion.scope == scope)
+    )
+    return version or 0
+
+
+async def bump_scope_versions(db, *scopes: str):
+    # Executado na mesma transação da escrita: outros workers passam a ver a
+    # nova versão assim que o commit acontece.
+    for scope in scopes:
+        stmt = dialect_insert(db, CatalogVersion).values(
+            scope=scope, version=1
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[CatalogVersion.scope],
+                set_={'version': CatalogVersion.version + 1},
+            )
+        )
+    catalog_cache.discard_scopes(*scopes)
+
+
+catalog_cache = LRUCache(
+    maxsize=settings.CATALOG_CACHE_SIZE, ttl=settings.CATALOG_CACHE_TTL
+)
@@ -0,0 +1,153 @@
+import csv
+import json
+from itertools import islice
+from typing import List
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert
+
+from fast_tech.cache import COURSES_SCOPE, bump_scope_versions, company_scope
+from fast_tech.db import existing_values
+from fast_tech.models import Company, Curso
+from fast_tech.schema import CursoCreate
+
+IMPORT_BATCH_SIZE = 1000
+
+cursos_adapter = TypeAdapter(List[CursoCreate])
+
+
+def _row_errors(error: ValidationError) -> dict:
+    # Agrupa os erros do lote pelo índice da linha (primeiro item do `loc`)
+    errors = {}
+    for item in error.errors(include_url=False):
+        index, *field = item['loc'] or (None,)
+        errors.setdefault(index, []).append({
+            'field': '.'.join(str(part) for part in field) or None,
+            'msg': item['msg'],
+        })
+    return errors
+
+
+INVALID_JSON = 'Linha inválida: não é um objeto JSON'
+INVALID_ENCODING = 'Linha inválida: o arquivo precisa estar em UTF-8'
+
+
+class RowError(str):
+    """Linha que não pôde ser lida; o texto é a mensagem de erro."""
+
+
+def _decode_lines(file, bad_lines: set):
+    # Cada linha é decodificada à parte: bytes fora do UTF-8 (um CSV salvo
+    # em cp1252 pelo Excel) invalidam só as linhas onde aparecem
+    for number, raw in enumerate(file, 1):
+        try:
+            yield raw.decode('utf-8-sig' if number == 1 else 'utf-8')
+        except UnicodeDecodeError:
+            bad_lines.add(number)
+            yield raw.decode('utf-8', errors='replace')
+
+
+def read_rows(file, fmt: str):
+    # Lê o arquivo enviado linha a linha, sem carregá-lo inteiro na memória
+    bad_lines = set()
+    lines = _decode_lines(file, bad_lines)
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        last_line = 0
+        for row in reader:
+            # Um registro CSV pode ocupar várias linhas (campos com aspas)
+            span = range(last_line + 1, reader.line_num + 1)
+            last_line = reader.line_num
+            if bad_lines.intersection(span):
+                yield RowError(INVALID_ENCODING)
+            else:
+                yield row
+        return
+
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        if number in bad_lines:
+            yield RowError(INVALID_ENCODING)
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield RowError(INVALID_JSON)
+
+
+def _validate_batch(raw_rows):
+    try:
+        return cursos_adapter.validate_python(raw_rows), {}
+    except ValidationError as error:
+        errors = _row_errors(error)
+
+    valid = []
+    for index, raw in enumerate(raw_rows):
+        if index in errors:
+            valid.append(None)
+        else:
+            valid.append(CursoCreate.model_validate(raw))
+    return valid, errors
+
+
+async def import_courses(db, rows) -> dict:
+    summary = {'total': 0, 'created': 0, 'failed': 0, 'errors': []}
+    rows = iter(rows)
+
+    while batch := list(islice(rows, IMPORT_BATCH_SIZE)):
+        first_row = summary['total'] + 1
+        summary['total'] += len(batch)
+
+        errors = {
+            index: [
+                {
+                    'field': None,
+                    'msg': raw if isinstance(raw, RowError) else INVALID_JSON,
+                }
+            ]
+            for index, raw in enumerate(batch)
+            if not isinstance(raw, dict)
+        }
+        raw_rows = [raw if isinstance(raw, dict) else {} for raw in batch]
+        cursos, validation_errors = _validate_batch(raw_rows)
+        for index, row_errors in validation_errors.items():
+            errors.setdefault(index, row_errors)
+
+        empresas = await existing_values(
+            db, Company.id, {c.company_id for c in cursos if c is not None}
+        )
+
+        values = []
+        for index, curso in enumerate(cursos):
+            if index in errors:
+                continue
+            if curso.company_id not in empresas:
+                errors[index] = [
+                    {
+                        'field': 'company_id',
+                        'msg': (
+                            f'Empresa com ID {curso.company_id} não encontrada'
+                        ),
+                    }
+                ]
+                continue
+            values.append(curso.model_dump())
+
+        if values:
+            await db.execute(insert(Curso.__table__), values)
+            await bump_scope_versions(
+                db,
+                COURSES_SCOPE,
+                *{company_scope(value['company_id']) for value in values},
+            )
+            await db.commit()
+
+        summary['created'] += len(values)
+        summary['failed'] += len(errors)
+        summary['errors'].extend(
+            {'row': first_row + index, 'errors': errors[index]}
+            for index in sorted(errors)
+        )
+
+    return summary
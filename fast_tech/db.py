@@ -1,18 +1,175 @@
-from sqlalchemy import create_engine
+from functools import partial
+
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import registry, sessionmaker
 
-# CORRIJA A STRING DE CONEXÃO (adicione 3 barras para SQLite)
-SQLALCHEMY_DATABASE_URL = 'sqlite:///./test.db'  # Note as 3 barras
+from fast_tech.metrics import instrument_engine
+from fast_tech.settings import settings
+
+# Limite de parâmetros por cláusula IN
+ID_CHUNK_SIZE = 500
+
+# Driver assíncrono usado para cada backend quando a URL é síncrona
+ASYNC_DRIVERS = {
+    'sqlite': 'aiosqlite',
+    'postgresql': 'asyncpg',
+    'mysql': 'aiomysql',
+}
+
+
+def to_async_url(url: str | URL) -> URL:
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if url.get_driver_name() == ASYNC_DRIVERS.get(backend):
+        return url
+    return url.set(drivername=f'{backend}+{ASYNC_DRIVERS[backend]}')
+
+
+def to_sync_url(url: str | URL) -> URL:
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if url.get_driver_name() == ASYNC_DRIVERS.get(backend):
+        return url.set(drivername=backend)
+    return url
+
+
+def is_memory_database(url: URL) -> bool:
+    return url.get_backend_name() == 'sqlite' and url.database in {
+        None,
+        '',
+        ':memory:',
+    }
+
+
+def sqlite_read_only_url(url: URL) -> URL:
+    # Abre o arquivo via URI com mode=ro: o SQLite recusa qualquer escrita
+    if is_memory_database(url) or url.query.get('uri'):
+        return url
+    return url.set(
+        database=f'file:{url.database}?mode=ro', query={'uri': 'true'}
+    )
+
+
+def sqlite_pragmas(read_only: bool = False) -> list[str]:
+    pragmas = [
+        f'PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}',
+        f'PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}',
+        f'PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}',
+        f'PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}',
+        f'PRAGMA temp_store={settings.SQLITE_TEMP_STORE}',
+    ]
+    if read_only:
+        pragmas.append('PRAGMA query_only=ON')
+    else:
+        # journal_mode=WAL fica gravado no arquivo: só conexões de escrita
+        # precisam (e conseguem) aplicá-lo
+        pragmas.insert(
+            0, f'PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}'
+        )
+    return pragmas
+
+
+def _apply_pragmas(pragmas, dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in pragmas:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def create_db_engine(
+    url: str | URL, asynchronous: bool = False, read_only: bool = False
+):
+    """Engine configurada pelas settings (pool, echo e pragmas do SQLite).
 
-# Crie a engine com a URL corrigida
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={'check_same_thread': False},  # Importante para SQLite
-    echo=True,
-    future=True,
+    Com `read_only=True` o SQLite abre o arquivo em `mode=ro` e com
+    `query_only`, para leituras que nunca disputam o lock de escrita.
+    """
+    url = to_async_url(url) if asynchronous else to_sync_url(url)
+    sqlite_backend = url.get_backend_name() == 'sqlite'
+    if sqlite_backend and read_only:
+        url = sqlite_read_only_url(url)
+
+    options = {'echo': settings.SQL_ECHO}
+    if not is_memory_database(url):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    if sqlite_backend and not asynchronous:
+        options['connect_args'] = {'check_same_thread': False}
+
+    if asynchronous:
+        db_engine = create_async_engine(url, **options)
+        sync_engine = db_engine.sync_engine
+    else:
+        db_engine = sync_engine = create_engine(url, **options)
+
+    if sqlite_backend:
+        event.listen(
+            sync_engine,
+            'connect',
+            partial(_apply_pragmas, sqlite_pragmas(read_only)),
+        )
+    instrument_engine(sync_engine)
+    return db_engine
+
+
+# A mesma DATABASE_URL (síncrona ou assíncrona) gera as duas engines
+SQLALCHEMY_DATABASE_URL = to_sync_url(settings.DATABASE_URL)
+ASYNC_SQLALCHEMY_DATABASE_URL = to_async_url(settings.DATABASE_URL)
+
+# Engine síncrona: migrations, scripts e testes
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
+
+# Engine assíncrona: usada pelas rotas da API
+async_engine = create_db_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL, asynchronous=True
+)
+
+# Engine somente leitura: rotas GET, sem disputar o lock com as escritas.
+# Um SQLite em memória não pode ser reaberto: usa a própria async_engine.
+async_read_engine = (
+    async_engine
+    if settings.DATABASE_READ_URL is None
+    and is_memory_database(ASYNC_SQLALCHEMY_DATABASE_URL)
+    else create_db_engine(
+        settings.DATABASE_READ_URL or settings.DATABASE_URL,
+        asynchronous=True,
+        read_only=True,
+    )
 )
 
 mapper_registry = registry()
 Base = mapper_registry.generate_base()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    async_read_engine, autoflush=False, expire_on_commit=False
+)
+
+
+def dialect_insert(session, table):
+    # `insert()` com suporte a ON CONFLICT do dialeto em uso
+    if session.get_bind().dialect.name == 'postgresql':
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
+def chunked(values, size=ID_CHUNK_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+async def existing_values(db, column, values) -> set:
+    found = set()
+    for chunk in chunked(set(values)):
+        found.update(await db.scalars(select(column).where(column.in_(chunk))))
+    return found
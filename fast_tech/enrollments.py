@@ -0,0 +1,249 @@
+import asyncio
+import logging
+from collections import Counter, defaultdict
+from http import HTTPStatus
+
+from sqlalchemy import bindparam, func, select, update
+
+from fast_tech.db import (
+    AsyncSessionLocal,
+    chunked,
+    dialect_insert,
+    existing_values,
+)
+from fast_tech.models import Curso, Inscricao, User
+from fast_tech.recommendations import record_enrollments
+from fast_tech.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CURSO_NAO_ENCONTRADO = 'Curso não encontrado.'
+ALUNO_NAO_ENCONTRADO = 'Aluno não encontrado.'
+JA_INSCRITO = 'Aluno já está inscrito nesse curso.'
+INSCRITO = 'Inscrição realizada com sucesso'
+
+
+async def existing_enrollments(db, pairs) -> set:
+    # Agrupa por curso: `course_id = ? AND student_id IN (...)` é resolvido
+    # pelo índice único (student_id, course_id) sem varrer a tabela.
+    students_by_course = defaultdict(set)
+    for student_id, course_id in pairs:
+        students_by_course[course_id].add(student_id)
+
+    found = set()
+    for course_id, student_ids in students_by_course.items():
+        for chunk in chunked(student_ids):
+            rows = await db.execute(
+                select(Inscricao.student_id, Inscricao.course_id).where(
+                    Inscricao.course_id == course_id,
+                    Inscricao.student_id.in_(chunk),
+                )
+            )
+            found.update(tuple(row) for row in rows)
+    return found
+
+
+def insert_enrollments(db):
+    return dialect_insert(db, Inscricao).on_conflict_do_nothing(
+        index_elements=[Inscricao.student_id, Inscricao.course_id]
+    )
+
+
+cursos = Curso.__table__
+
+
+async def bump_enrollment_counts(db, course_ids):
+    # Na mesma transação das inscrições: um UPDATE por curso afetado
+    counts = Counter(course_ids)
+    if not counts:
+        return
+    await db.execute(
+        update(cursos)
+        .where(cursos.c.id == bindparam('curso_id'))
+        .values(
+            enrollment_count=cursos.c.enrollment_count + bindparam('delta')
+        ),
+        [
+            {'curso_id': course_id, 'delta': delta}
+            for course_id, delta in counts.items()
+        ],
+    )
+
+
+def repair_enrollment_counts():
+    # Recalcula só os cursos cujo contador divergiu; o COUNT por curso usa o
+    # índice (course_id, student_id)
+    actual = (
+        select(func.count())
+        .select_from(Inscricao.__table__)
+        .where(Inscricao.__table__.c.course_id == cursos.c.id)
+        .scalar_subquery()
+    )
+    return (
+        update(cursos)
+        .where(cursos.c.enrollment_count != actual)
+        .values(enrollment_count=actual)
+    )
+
+
+async def enroll_many(db, pairs) -> list[dict]:
+    """Valida e insere inscrições em lote, sem fazer commit.
+
+    Retorna um resultado por par, na ordem recebida, com o mesmo status e
+    mensagem que `POST /enrollments` daria para aquele item.
+    """
+    courses = await existing_values(db, Curso.id, (c for _, c in pairs))
+    students = await existing_values(db, User.id, (s for s, _ in pairs))
+    valid = {(s, c) for s, c in pairs if s in students and c in courses}
+    taken = await existing_enrollments(db, valid)
+
+    to_insert = [
+        {'student_id': s, 'course_id': c}
+        for s, c in dict.fromkeys(pairs)
+        if (s, c) in valid and (s, c) not in taken
+    ]
+    created = {}
+    if to_insert:
+        rows = await db.execute(
+            insert_enrollments(db).returning(
+                Inscricao.id, Inscricao.student_id, Inscricao.course_id
+            ),
+            to_insert,
+        )
+        created = {(row.student_id, row.course_id): row.id for row in rows}
+        await bump_enrollment_counts(db, (c for _, c in created))
+        await record_enrollments(db, created)
+
+    results = []
+    for student_id, course_id in pairs:
+        result = {'student_id': student_id, 'course_id': course_id}
+        if course_id not in courses:
+            result.update(
+                status_code=HTTPStatus.NOT_FOUND, detail=CURSO_NAO_ENCONTRADO
+            )
+        elif student_id not in students:
+            result.update(
+                status_code=HTTPStatus.NOT_FOUND, detail=ALUNO_NAO_ENCONTRADO
+            )
+        elif (student_id, course_id) in created:
+            # Pares repetidos na mesma requisição: só o primeiro é criado
+            result.update(
+                status_code=HTTPStatus.CREATED,
+                detail=INSCRITO,
+                enrollment_id=created.pop((student_id, course_id)),
+            )
+        else:
+            result.update(status_code=HTTPStatus.CONFLICT, detail=JA_INSCRITO)
+        results.append(result)
+    return results
+
+
+class EnrollmentWriter:
+    """Grava inscrições concorrentes em lote, com um commit por lote.
+
+    Cada `submit` entra numa fila lida por uma única tarefa, que junta até
+    `max_rows` pares (ou o que chegar em `max_wait` segundos) e os grava com
+    `enroll_many` numa só transação. Quem chamou recebe o próprio resultado,
+    com o mesmo status que `POST /enrollments` daria.
+    """
+
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        max_rows: int = 256,
+        max_wait: float = 0.002,
+    ):
+        self.session_factory = session_factory
+        self.max_rows = max_rows
+        self.max_wait = max_wait
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._batches = 0
+        self._rows = 0
+        self._last_batch = 0
+
+    def start(self):
+        # Fila e tarefa presas ao event loop em execução
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        # Grava o que já estava na fila antes de encerrar
+        if self._task is not None:
+            await self._queue.put(None)
+            await self._task
+            self._queue = self._task = None
+
+    async def submit(self, student_id: int, course_id: int) -> dict:
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(((student_id, course_id), future))
+        return await future
+
+    async def _next_batch(self):
+        first = await self._queue.get()
+        if first is None:
+            return None, True
+        batch = [first]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_rows:
+            if self._queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except TimeoutError:
+                    break
+            else:
+                item = self._queue.get_nowait()
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._next_batch()
+            if batch:
+                await self._flush(batch)
+
+    async def _flush(self, batch):
+        try:
+            async with self.session_factory() as db:
+                results = await enroll_many(db, [pair for pair, _ in batch])
+                await db.commit()
+        except Exception as exc:
+            logger.exception(
+                'Falha ao gravar lote de %d inscrições', len(batch)
+            )
+            results = [exc] * len(batch)
+
+        self._batches += 1
+        self._rows += len(batch)
+        self._last_batch = len(batch)
+        for (_, future), result in zip(batch, results):
+            # O cliente pode ter desistido (requisição cancelada)
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            'queue_depth': self._queue.qsize() if self._queue else 0,
+            'batches': self._batches,
+            'rows': self._rows,
+            'last_batch': self._last_batch,
+        }
+
+
+enrollment_writer = EnrollmentWriter(
+    max_rows=settings.ENROLLMENT_BATCH_MAX_ROWS,
+    max_wait=settings.ENROLLMENT_BATCH_MAX_WAIT_MS / 1000,
+)
@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from fast_tech.db import AsyncReadSessionLocal
+from fast_tech.models import Company, Curso, Inscricao, User
+
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_TABLES = {
+    'users': User,
+    'companies': Company,
+    'courses': Curso,
+    'enrollments': Inscricao,
+}
+
+# Colunas que nunca saem numa exportação
+EXCLUDED_COLUMNS = {'password'}
+
+MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def export_columns(model, requested: Optional[str] = None):
+    available = {
+        column.key: column
+        for column in model.__table__.columns
+        if column.key not in EXCLUDED_COLUMNS
+    }
+    names = [
+        name.strip() for name in (requested or '').split(',') if name.strip()
+    ]
+    if not names:
+        return list(available.values())
+
+    invalid = [name for name in names if name not in available]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f'Colunas inválidas para exportação: {", ".join(invalid)}',
+        )
+    return [available[name] for name in names]
+
+
+def _ndjson_chunk(keys, rows) -> str:
+    return ''.join(
+        json.dumps(dict(zip(keys, row)), ensure_ascii=False) + '\n'
+        for row in rows
+    )
+
+
+def _csv_chunk(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+async def stream_export(model, columns, fmt: str):
+    # A sessão é aberta aqui (e não via Depends) porque o corpo é produzido
+    # depois que a rota já retornou.
+    keys = [column.key for column in columns]
+    stmt = (
+        select(*columns)
+        .order_by(*model.__table__.primary_key.columns)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    if fmt == 'csv':
+        yield _csv_chunk([keys])
+
+    async with AsyncReadSessionLocal() as db:
+        result = await db.stream(stmt)
+        async for rows in result.partitions():
+            if fmt == 'csv':
+                yield _csv_chunk(rows)
+            else:
+                yield _ndjson_chunk(keys, rows)
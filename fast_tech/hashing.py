@@ -0,0 +1,176 @@
+import asyncio
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from functools import cache
+
+from fast_tech.settings import settings
+
+
+class HasherBusyError(Exception):
+    pass
+
+
+@cache
+def get_pwd_context():
+    # passlib e o backend bcrypt só são carregados no primeiro hash/verify,
+    # fora do caminho de inicialização dos workers.
+    from passlib.context import CryptContext  # noqa: PLC0415
+
+    return CryptContext(schemes=['bcrypt'], deprecated='auto')
+
+
+# Funções de módulo para poderem ser serializadas pelo ProcessPoolExecutor
+def _hash(password: str) -> str:
+    return get_pwd_context().hash(password)
+
+
+def _verify(password: str, hashed: str) -> bool:
+    return get_pwd_context().verify(password, hashed)
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class PasswordHasher:
+    """Executa hash/verify do bcrypt num pool dedicado, fora do event loop.
+
+    A fila é limitada: quando `max_workers + max_queue` operações já estão
+    pendentes, novas chamadas falham imediatamente com `HasherBusyError`.
+    """
+
+    def __init__(
+        self,
+        executor: str = 'thread',
+        max_workers: int | None = None,
+        max_queue: int = 64,
+        latency_window: int = 1024,
+    ):
+        self.executor_kind = executor
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latencies = deque(maxlen=latency_window)
+        self._dummy_hash: str | None = None
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.executor_kind == 'process':
+                    self._executor = ProcessPoolExecutor(self.max_workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        self.max_workers, thread_name_prefix='password-hasher'
+                    )
+            return self._executor
+
+    def _submit(self, fn, *args):
+        executor = self._get_executor()
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise HasherBusyError('Fila de hash de senha cheia')
+            self._pending += 1
+
+        started = time.perf_counter()
+        try:
+            future = executor.submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(lambda _: self._done(started))
+        return future
+
+    def _done(self, started: float):
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+            self._latencies.append(elapsed)
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(_hash, password))
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await asyncio.wrap_future(
+            self._submit(_verify, password, hashed)
+        )
+
+    async def verify_or_dummy(self, password: str, hashed: str | None) -> bool:
+        # Sem usuário, verifica contra um hash descartável: a recusa custa o
+        # mesmo bcrypt e não revela se o username existe
+        if hashed is not None:
+            return await self.verify(password, hashed)
+        if self._dummy_hash is None:
+            self._dummy_hash = await self.hash(secrets.token_urlsafe(16))
+        await self.verify(password, self._dummy_hash)
+        return False
+
+    async def hash_many(self, passwords) -> list[str]:
+        # Envia em janelas do tamanho do pool: o lote usa todos os workers
+        # sem ocupar a fila que os logins concorrentes precisam.
+        passwords = list(passwords)
+        hashes = []
+        for start in range(0, len(passwords), self.max_workers):
+            window = passwords[start : start + self.max_workers]
+            hashes.extend(
+                await asyncio.gather(*(self.hash(p) for p in window))
+            )
+        return hashes
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = self._pending
+            completed = self._completed
+            rejected = self._rejected
+            latencies = list(self._latencies)
+
+        return {
+            'executor': self.executor_kind,
+            'workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'in_flight': min(pending, self.max_workers),
+            'queue_depth': max(pending - self.max_workers, 0),
+            'completed': completed,
+            'rejected': rejected,
+            'latency_ms': {
+                'mean': (
+                    sum(latencies) / len(latencies) * 1000
+                    if latencies
+                    else 0.0
+                ),
+                'p50': percentile(latencies, 50) * 1000,
+                'p95': percentile(latencies, 95) * 1000,
+                'p99': percentile(latencies, 99) * 1000,
+            },
+        }
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+password_hasher = PasswordHasher(
+    executor=settings.PASSWORD_HASHER_EXECUTOR,
+    max_workers=settings.PASSWORD_HASHER_WORKERS,
+    max_queue=settings.PASSWORD_HASHER_MAX_QUEUE,
+)
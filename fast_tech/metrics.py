@@ -0,0 +1,181 @@
+import logging
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from fast_tech.settings import settings
+
+logger = logging.getLogger('fast_tech.sql')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+
+class RequestStats:
+    __slots__ = ('queries', 'db_time')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+# Estatísticas SQL da requisição em andamento (definidas pelo middleware)
+current_request = ContextVar('current_request', default=None)
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.request_latency = defaultdict(Histogram)
+        self.request_queries = defaultdict(int)
+        self.request_db_time = defaultdict(float)
+        self.admission_wait = defaultdict(Histogram)
+        self.queries = 0
+        self.query_time = 0.0
+        self.slow_queries = 0
+
+    def record_query(self, elapsed: float, slow: bool):
+        with self._lock:
+            self.queries += 1
+            self.query_time += elapsed
+            self.slow_queries += slow
+
+    def record_request(self, labels: tuple, elapsed: float, stats):
+        with self._lock:
+            self.request_latency[labels].observe(elapsed)
+            self.request_queries[labels] += stats.queries
+            self.request_db_time[labels] += stats.db_time
+
+    def record_admission(self, group: str, waited: float):
+        with self._lock:
+            self.admission_wait[group].observe(waited)
+
+    def render(self, extra_gauges: dict | None = None) -> str:
+        lines = [
+            '# TYPE http_request_duration_seconds histogram',
+        ]
+        with self._lock:
+            for (method, route), hist in sorted(self.request_latency.items()):
+                labels = f'method="{method}",route="{route}"'
+                cumulative = 0
+                for bound, count in zip((*hist.buckets, '+Inf'), hist.counts):
+                    cumulative += count
+                    lines.append(
+                        'http_request_duration_seconds_bucket'
+                        f'{{{labels},le="{bound}"}} {cumulative}'
+                    )
+                lines.extend((
+                    f'http_request_duration_seconds_sum{{{labels}}} '
+                    f'{hist.sum}',
+                    f'http_request_duration_seconds_count{{{labels}}} '
+                    f'{hist.count}',
+                ))
+
+            lines.append('# TYPE http_request_db_queries_total counter')
+            for (method, route), total in sorted(self.request_queries.items()):
+                lines.append(
+                    'http_request_db_queries_total'
+                    f'{{method="{method}",route="{route}"}} {total}'
+                )
+            lines.append('# TYPE http_request_db_seconds_total counter')
+            for (method, route), total in sorted(self.request_db_time.items()):
+                lines.append(
+                    'http_request_db_seconds_total'
+                    f'{{method="{method}",route="{route}"}} {total}'
+                )
+
+            lines.append('# TYPE admission_queue_seconds histogram')
+            for group, hist in sorted(self.admission_wait.items()):
+                cumulative = 0
+                for bound, count in zip((*hist.buckets, '+Inf'), hist.counts):
+                    cumulative += count
+                    lines.append(
+                        'admission_queue_seconds_bucket'
+                        f'{{group="{group}",le="{bound}"}} {cumulative}'
+                    )
+                lines.extend((
+                    f'admission_queue_seconds_sum{{group="{group}"}} '
+                    f'{hist.sum}',
+                    f'admission_queue_seconds_count{{group="{group}"}} '
+                    f'{hist.count}',
+                ))
+
+            lines.extend((
+                '# TYPE db_queries_total counter',
+                f'db_queries_total {self.queries}',
+                '# TYPE db_query_seconds_total counter',
+                f'db_query_seconds_total {self.query_time}',
+                '# TYPE db_slow_queries_total counter',
+                f'db_slow_queries_total {self.slow_queries}',
+            ))
+
+        for name, value in (extra_gauges or {}).items():
+            lines.extend((f'# TYPE {name} gauge', f'{name} {value}'))
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+
+
+def _before_cursor_execute(conn, cursor, statement, *args):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, *args):
+    elapsed = time.perf_counter() - conn.info['query_start'].pop()
+
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+
+    slow = elapsed * 1000 >= settings.SLOW_QUERY_MS
+    metrics.record_query(elapsed, slow)
+    if slow and random.random() < settings.SLOW_QUERY_SAMPLE_RATE:  # noqa: S311
+        # Só a quantidade de parâmetros: os valores incluem hashes de senha,
+        # emails e tokens
+        logger.warning(
+            'Consulta lenta (%.1f ms, %d %s): %s',
+            elapsed * 1000,
+            len(parameters or ()),
+            'linhas' if context.executemany else 'parâmetros',
+            statement,
+        )
+
+
+def _handle_error(context):
+    # Consulta que falhou não passa pelo after_cursor_execute
+    if context.connection is not None:
+        starts = context.connection.info.get('query_start')
+        if starts:
+            starts.pop()
+
+
+def instrument_engine(sync_engine):
+    event.listen(sync_engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(sync_engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(sync_engine, 'handle_error', _handle_error)
+
+
+def server_timing(stats, elapsed: float) -> str:
+    return (
+        f'db;desc="{stats.queries} queries";dur={stats.db_time * 1000:.1f}, '
+        f'total;dur={elapsed * 1000:.1f}'
+    )
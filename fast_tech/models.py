@@ -1,6 +1,7 @@
+from datetime import datetime
 from typing import List
 
-from sqlalchemy import Column, ForeignKey, Integer
+from sqlalchemy import DDL, Column, ForeignKey, Index, Integer, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from fast_tech.db import Base
@@ -34,19 +35,136 @@ class Company(Base):
 
 class Curso(Base):
     __tablename__ = 'cursos'
+    __table_args__ = (
+        # Cursos de uma empresa em ordem de id (paginação por cursor)
+        Index('ix_cursos_company_id_id', 'company_id', 'id'),
+    )
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str]
     description: Mapped[str]
     youtube_link: Mapped[str]
     company_id: Mapped[int] = mapped_column(ForeignKey('companies.id'))
+    # Mantido junto com as inscrições (fast_tech.enrollments); o reparo
+    # recalcula a partir de inscricoes_cursos
+    enrollment_count: Mapped[int] = mapped_column(
+        default=0, server_default='0'
+    )
 
     empresa = relationship('Company', back_populates='cursos')
 
 
+# Índice FTS5 (SQLite) sobre nome e descrição dos cursos, mantido por triggers
+CURSOS_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE cursos_fts USING fts5(
+        name, description, content='cursos', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER cursos_fts_ai AFTER INSERT ON cursos BEGIN
+        INSERT INTO cursos_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER cursos_fts_ad AFTER DELETE ON cursos BEGIN
+        INSERT INTO cursos_fts(cursos_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER cursos_fts_au AFTER UPDATE OF name, description ON cursos
+    BEGIN
+        INSERT INTO cursos_fts(cursos_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO cursos_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+]
+
+for statement in CURSOS_FTS_DDL:
+    event.listen(
+        Curso.__table__,
+        'after_create',
+        DDL(statement).execute_if(dialect='sqlite'),
+    )
+event.listen(
+    Curso.__table__,
+    'before_drop',
+    DDL('DROP TABLE IF EXISTS cursos_fts').execute_if(dialect='sqlite'),
+)
+
+
 class Inscricao(Base):
     __tablename__ = 'inscricoes_cursos'
+    __table_args__ = (
+        # Também cobre "cursos do aluno" (student_id -> course_id)
+        Index(
+            'uq_inscricoes_cursos_student_course',
+            'student_id',
+            'course_id',
+            unique=True,
+        ),
+        # Cobre "alunos do curso" (course_id -> student_id)
+        Index(
+            'ix_inscricoes_cursos_course_student', 'course_id', 'student_id'
+        ),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     student_id = Column(Integer, ForeignKey('users.id'))
     course_id = Column(Integer, ForeignKey('cursos.id'))
+
+
+class CatalogVersion(Base):
+    __tablename__ = 'catalog_versions'
+
+    scope: Mapped[str] = mapped_column(primary_key=True)
+    version: Mapped[int] = mapped_column(default=0)
+
+
+class CourseCooccurrence(Base):
+    # Matriz esparsa de co-inscrições: alunos que fizeram os dois cursos.
+    # Simétrica (um registro para cada sentido do par).
+    __tablename__ = 'course_cooccurrences'
+
+    course_id: Mapped[int] = mapped_column(
+        ForeignKey('cursos.id'), primary_key=True
+    )
+    similar_id: Mapped[int] = mapped_column(
+        ForeignKey('cursos.id'), primary_key=True
+    )
+    shared: Mapped[int] = mapped_column(default=0)
+
+
+class CourseNeighbor(Base):
+    # Top-K de `course_cooccurrences` por curso, lido pelas recomendações
+    __tablename__ = 'course_neighbors'
+
+    course_id: Mapped[int] = mapped_column(
+        ForeignKey('cursos.id'), primary_key=True
+    )
+    neighbor_id: Mapped[int] = mapped_column(
+        ForeignKey('cursos.id'), primary_key=True
+    )
+    shared: Mapped[int]
+
+
+class RefreshToken(Base):
+    # Só o SHA-256 do token opaco é guardado; a busca é pelo índice único
+    __tablename__ = 'refresh_tokens'
+    __table_args__ = (Index('ix_refresh_tokens_family', 'family'),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    token_hash: Mapped[str] = mapped_column(unique=True)
+    # Tokens gerados por rotação a partir do mesmo login
+    family: Mapped[str]
+    role: Mapped[str]
+    subject_id: Mapped[int]
+    expires_at: Mapped[datetime]
+    revoked: Mapped[bool] = mapped_column(default=False)
+    # Quando o token foi trocado por outro; logout e reuso não preenchem
+    rotated_at: Mapped[datetime | None] = mapped_column(default=None)
@@ -0,0 +1,60 @@
+import base64
+import json
+from typing import Generic, List, Optional, TypeVar
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# Faixa do INTEGER do SQLite: fora dela o id nem chega a ser ligado à query
+CURSOR_ID_RANGE = range(-(2**63), 2**63)
+
+T = TypeVar('T')
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(last_id: int, **position) -> str:
+    raw = json.dumps({'id': last_id, **position}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor_position(cursor: str) -> dict:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded))
+        # Só o int que o encode_cursor gerou: nada de true, 1.5 ou "1"
+        if type(position['id']) is not int:
+            raise TypeError('id do cursor não é inteiro')
+        if position['id'] not in CURSOR_ID_RANGE:
+            raise OverflowError('id do cursor fora da faixa')
+        return position
+    except (ValueError, KeyError, TypeError, OverflowError):
+        raise HTTPException(status_code=400, detail='Cursor inválido.')
+
+
+def decode_cursor(cursor: str) -> int:
+    return decode_cursor_position(cursor)['id']
+
+
+async def paginate(db, stmt, key, limit: int, after: Optional[str]):
+    # Paginação por chave (keyset): `key > último id` usa o índice da chave,
+    # então cada página custa o mesmo independente da profundidade.
+    if after is not None:
+        stmt = stmt.where(key > decode_cursor(after))
+    stmt = stmt.order_by(key).limit(limit + 1)
+    rows = (await db.execute(stmt)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(getattr(rows[-1], key.key))
+
+    return {
+        'items': [row._asdict() for row in rows],
+        'next_cursor': next_cursor,
+    }
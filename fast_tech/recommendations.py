@@ -0,0 +1,199 @@
+import heapq
+from collections import Counter, defaultdict
+from itertools import permutations
+
+from sqlalchemy import bindparam, delete, func, select, text
+
+from fast_tech.db import chunked, dialect_insert
+from fast_tech.models import (
+    CourseCooccurrence,
+    CourseNeighbor,
+    Curso,
+    Inscricao,
+)
+from fast_tech.settings import settings
+
+# DELETE em lote (executemany) só existe no Core, não no ORM
+neighbors_table = CourseNeighbor.__table__
+
+# Reconstrução completa: co-inscrições por self-join agregado e top-K por
+# curso com ROW_NUMBER, tudo dentro do banco
+REBUILD_SQL = (
+    'DELETE FROM course_neighbors',
+    'DELETE FROM course_cooccurrences',
+    """
+    INSERT INTO course_cooccurrences (course_id, similar_id, shared)
+    SELECT a.course_id, b.course_id, COUNT(*)
+    FROM inscricoes_cursos AS a
+    JOIN inscricoes_cursos AS b
+      ON b.student_id = a.student_id AND b.course_id != a.course_id
+    GROUP BY a.course_id, b.course_id
+    """,
+    """
+    INSERT INTO course_neighbors (course_id, neighbor_id, shared)
+    SELECT course_id, similar_id, shared
+    FROM (
+        SELECT course_id, similar_id, shared,
+               ROW_NUMBER() OVER (
+                   PARTITION BY course_id ORDER BY shared DESC, similar_id
+               ) AS position
+        FROM course_cooccurrences
+    ) AS ranked
+    WHERE position <= :neighbors
+    """,
+)
+
+
+def rebuild_recommendations(conn, neighbors: int | None = None):
+    neighbors = neighbors or settings.RECOMMENDATION_NEIGHBORS
+    for statement in REBUILD_SQL:
+        conn.execute(text(statement), {'neighbors': neighbors})
+
+
+def _rank(item):
+    # Maior contagem primeiro; empate pelo menor id (igual ao rebuild)
+    similar_id, shared = item
+    return -shared, similar_id
+
+
+async def _cooccurrence_increments(db, pairs) -> Counter:
+    new_courses = defaultdict(set)
+    for student_id, course_id in pairs:
+        new_courses[student_id].add(course_id)
+
+    taken = defaultdict(set)
+    for chunk in chunked(new_courses):
+        rows = await db.execute(
+            select(Inscricao.student_id, Inscricao.course_id).where(
+                Inscricao.student_id.in_(chunk)
+            )
+        )
+        for student_id, course_id in rows:
+            taken[student_id].add(course_id)
+
+    increments = Counter()
+    for student_id, new in new_courses.items():
+        for course_id in new:
+            for other_id in taken[student_id] - new:
+                increments[course_id, other_id] += 1
+                increments[other_id, course_id] += 1
+        # Cursos novos entre si: cada sentido do par uma vez
+        increments.update(permutations(new, 2))
+    return increments
+
+
+async def record_enrollments(db, pairs):
+    """Atualiza o índice de recomendações para inscrições recém-criadas.
+
+    Roda na transação da inscrição (os pares já devem estar inseridos). As
+    contagens só crescem, então o novo top-K de um curso sai do top-K atual
+    somado aos pares que mudaram.
+    """
+    increments = await _cooccurrence_increments(db, pairs)
+    if not increments:
+        return
+
+    stmt = dialect_insert(db, CourseCooccurrence)
+    rows = await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[
+                CourseCooccurrence.course_id,
+                CourseCooccurrence.similar_id,
+            ],
+            set_={'shared': CourseCooccurrence.shared + stmt.excluded.shared},
+        ).returning(
+            CourseCooccurrence.course_id,
+            CourseCooccurrence.similar_id,
+            CourseCooccurrence.shared,
+        ),
+        [
+            {'course_id': course_id, 'similar_id': similar_id, 'shared': delta}
+            for (course_id, similar_id), delta in increments.items()
+        ],
+    )
+    changed = defaultdict(dict)
+    for course_id, similar_id, shared in rows:
+        changed[course_id][similar_id] = shared
+
+    current = defaultdict(dict)
+    for chunk in chunked(changed):
+        rows = await db.execute(
+            select(
+                CourseNeighbor.course_id,
+                CourseNeighbor.neighbor_id,
+                CourseNeighbor.shared,
+            ).where(CourseNeighbor.course_id.in_(chunk))
+        )
+        for course_id, neighbor_id, shared in rows:
+            current[course_id][neighbor_id] = shared
+
+    evicted, upserts = [], []
+    for course_id, updates in changed.items():
+        merged = {**current[course_id], **updates}
+        top = dict(
+            heapq.nsmallest(
+                settings.RECOMMENDATION_NEIGHBORS, merged.items(), key=_rank
+            )
+        )
+        evicted.extend(
+            {'curso_id': course_id, 'vizinho_id': neighbor_id}
+            for neighbor_id in current[course_id].keys() - top.keys()
+        )
+        upserts.extend(
+            {'course_id': course_id, 'neighbor_id': neighbor_id, 'shared': n}
+            for neighbor_id, n in top.items()
+            if current[course_id].get(neighbor_id) != n
+        )
+
+    if evicted:
+        await db.execute(
+            delete(neighbors_table).where(
+                neighbors_table.c.course_id == bindparam('curso_id'),
+                neighbors_table.c.neighbor_id == bindparam('vizinho_id'),
+            ),
+            evicted,
+        )
+    if upserts:
+        stmt = dialect_insert(db, CourseNeighbor)
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    CourseNeighbor.course_id,
+                    CourseNeighbor.neighbor_id,
+                ],
+                set_={'shared': stmt.excluded.shared},
+            ),
+            upserts,
+        )
+
+
+async def recommend_courses(db, student_id: int, limit: int):
+    # Lê no máximo K vizinhos por curso do aluno, pela chave primária de
+    # course_neighbors; nada de self-join sobre as inscrições
+    taken = select(Inscricao.course_id).where(
+        Inscricao.student_id == student_id
+    )
+    score = func.sum(CourseNeighbor.shared).label('score')
+    ranked = (
+        select(CourseNeighbor.neighbor_id, score)
+        .where(
+            CourseNeighbor.course_id.in_(taken),
+            CourseNeighbor.neighbor_id.not_in(taken),
+        )
+        .group_by(CourseNeighbor.neighbor_id)
+        .order_by(score.desc(), CourseNeighbor.neighbor_id)
+        .limit(limit)
+        .subquery()
+    )
+    rows = await db.execute(
+        select(
+            Curso.id,
+            Curso.name,
+            Curso.description,
+            Curso.youtube_link,
+            ranked.c.score,
+        )
+        .join(ranked, ranked.c.neighbor_id == Curso.id)
+        .order_by(ranked.c.score.desc(), Curso.id)
+    )
+    return [row._asdict() for row in rows]
@@ -0,0 +1,108 @@
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import delete, select, update
+
+from fast_tech.models import RefreshToken
+from fast_tech.settings import settings
+
+
+def _utcnow() -> datetime:
+    # O SQLite guarda DateTime sem fuso: tudo em UTC ingênuo
+    return datetime.now(tz=ZoneInfo('UTC')).replace(tzinfo=None)
+
+
+def hash_refresh_token(token: str) -> str:
+    # 256 bits aleatórios dispensam bcrypt: um SHA-256 basta e custa µs
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def issue_refresh_token(
+    db, role: str, subject_id: int, family: str | None = None
+) -> str:
+    """Cria um refresh token para a sessão, sem fazer commit."""
+    token = secrets.token_urlsafe(32)
+    db.add(
+        RefreshToken(
+            token_hash=hash_refresh_token(token),
+            family=family or uuid.uuid4().hex,
+            role=role,
+            subject_id=subject_id,
+            expires_at=_utcnow()
+            + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+    )
+    return token
+
+
+async def revoke_family(db, family: str):
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family == family)
+        .values(revoked=True)
+    )
+
+
+async def _family_is_live(db, family: str) -> bool:
+    return (
+        await db.scalar(
+            select(RefreshToken.id)
+            .where(
+                RefreshToken.family == family,
+                RefreshToken.revoked.is_(False),
+            )
+            .limit(1)
+        )
+        is not None
+    )
+
+
+async def rotate_refresh_token(db, token: str):
+    """Troca o token por um novo da mesma família, sem fazer commit.
+
+    Devolve `(registro antigo, novo token)` ou None se o token não vale.
+    Reapresentar um token já trocado indica vazamento: a família inteira é
+    revogada. A exceção é a corrida entre duas renovações simultâneas (duas
+    abas): até `REFRESH_TOKEN_REUSE_GRACE_SECONDS` depois da troca, e com a
+    família ainda ativa, quem perdeu recebe outro token da mesma família.
+    """
+    stored = await db.scalar(
+        select(RefreshToken).where(
+            RefreshToken.token_hash == hash_refresh_token(token)
+        )
+    )
+    now = _utcnow()
+    if stored is None or stored.expires_at <= now:
+        return None
+
+    # UPDATE condicional: entre duas renovações simultâneas só uma troca o
+    # token; a outra cai na janela de tolerância abaixo
+    claimed = await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == stored.id, RefreshToken.revoked.is_(False))
+        .values(revoked=True, rotated_at=now)
+    )
+    if claimed.rowcount != 1:
+        rotated_at = await db.scalar(
+            select(RefreshToken.rotated_at).where(RefreshToken.id == stored.id)
+        )
+        grace = timedelta(seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS)
+        if (
+            rotated_at is None
+            or now - rotated_at > grace
+            or not await _family_is_live(db, stored.family)
+        ):
+            await revoke_family(db, stored.family)
+            return None
+
+    return stored, issue_refresh_token(
+        db, stored.role, stored.subject_id, stored.family
+    )
+
+
+def purge_refresh_tokens():
+    # Revogados ficam até vencer: ainda servem para detectar reuso
+    return delete(RefreshToken).where(RefreshToken.expires_at <= _utcnow())
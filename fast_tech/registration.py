@@ -0,0 +1,82 @@
+from http import HTTPStatus
+
+from fast_tech.db import chunked, dialect_insert, existing_values
+from fast_tech.hashing import password_hasher
+
+INSERT_CHUNK_SIZE = 500
+
+USER_UNIQUE_FIELDS = [
+    ('username', 'Username já existe'),
+    ('email', 'Email já existe'),
+]
+COMPANY_UNIQUE_FIELDS = [
+    *USER_UNIQUE_FIELDS,
+    ('cnpj', 'CNPJ já cadastrado'),
+]
+
+
+async def _uniqueness_errors(db, model, records, unique_fields) -> dict:
+    # Uma consulta IN por campo único cobre o lote inteiro; repetições dentro
+    # do próprio lote também são recusadas.
+    errors = {}
+    for field, message in unique_fields:
+        values = [getattr(record, field) for record in records]
+        taken = await existing_values(db, getattr(model, field), values)
+        seen = set()
+        for index, value in enumerate(values):
+            if index in errors:
+                continue
+            if value in taken or value in seen:
+                errors[index] = message
+            else:
+                seen.add(value)
+    return errors
+
+
+async def register_many(db, model, records, unique_fields) -> list[dict]:
+    """Cadastra alunos ou empresas em lote, com um resultado por registro."""
+    errors = await _uniqueness_errors(db, model, records, unique_fields)
+    # Encerra a transação de leitura antes do bcrypt: segurar o snapshot
+    # durante o hash do lote impede o checkpoint do WAL
+    await db.rollback()
+    valid = [i for i in range(len(records)) if i not in errors]
+    hashes = await password_hasher.hash_many(
+        records[i].password for i in valid
+    )
+
+    rows = [
+        {**records[i].model_dump(), 'password': hashed}
+        for i, hashed in zip(valid, hashes)
+    ]
+    created = {}
+    for chunk in chunked(rows, INSERT_CHUNK_SIZE):
+        # ON CONFLICT cobre cadastros concorrentes feitos depois da checagem
+        result = await db.execute(
+            dialect_insert(db, model.__table__)
+            .on_conflict_do_nothing()
+            .returning(model.id, model.username),
+            chunk,
+        )
+        created.update({row.username: row.id for row in result})
+        await db.commit()
+
+    results = []
+    for index, record in enumerate(records):
+        result = {'username': record.username}
+        if index in errors:
+            result.update(
+                status_code=HTTPStatus.BAD_REQUEST, detail=errors[index]
+            )
+        elif record.username in created:
+            result.update(
+                status_code=HTTPStatus.CREATED,
+                detail='Cadastro realizado com sucesso',
+                id=created[record.username],
+            )
+        else:
+            result.update(
+                status_code=HTTPStatus.CONFLICT,
+                detail='Cadastro conflitante feito por outra requisição',
+            )
+        results.append(result)
+    return results
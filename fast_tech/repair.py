@@ -0,0 +1,52 @@
+"""Recalcula dados derivados a partir das tabelas de origem.
+
+python -m fast_tech.repair                  # contadores de inscrições
+python -m fast_tech.repair recommendations  # índice de recomendações
+python -m fast_tech.repair refresh-tokens   # apaga tokens vencidos
+"""
+
+import argparse
+import sys
+import time
+
+from fast_tech.db import engine
+from fast_tech.enrollments import repair_enrollment_counts
+from fast_tech.recommendations import rebuild_recommendations
+from fast_tech.refresh_tokens import purge_refresh_tokens
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m fast_tech.repair')
+    parser.add_argument(
+        'targets',
+        nargs='*',
+        choices=['counts', 'recommendations', 'refresh-tokens'],
+        default=['counts'],
+    )
+    args = parser.parse_args(argv)
+
+    with engine.begin() as conn:
+        if 'counts' in args.targets:
+            repaired = conn.execute(repair_enrollment_counts()).rowcount
+            print(
+                f'enrollment_count corrigido em {repaired} curso(s)',
+                file=sys.stderr,
+            )
+        if 'recommendations' in args.targets:
+            started = time.perf_counter()
+            rebuild_recommendations(conn)
+            print(
+                'índice de recomendações reconstruído em '
+                f'{time.perf_counter() - started:.1f}s',
+                file=sys.stderr,
+            )
+        if 'refresh-tokens' in args.targets:
+            purged = conn.execute(purge_refresh_tokens()).rowcount
+            print(
+                f'{purged} refresh token(s) vencido(s) removido(s)',
+                file=sys.stderr,
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class Message(BaseModel):
@@ -13,14 +15,30 @@ class UserSchema(BaseModel):
     password: str
 
 
+class UserBulkCreate(BaseModel):
+    items: List[UserSchema] = Field(max_length=5_000)
+
+
+class RegistrationResult(BaseModel):
+    username: str
+    status_code: int
+    detail: str
+    id: Optional[int] = None
+
+
+class RegistrationBulkOut(BaseModel):
+    created: int
+    failed: int
+    results: List[RegistrationResult]
+
+
 class UserPublic(BaseModel):
     id: int
     username: str
     email: str
     phone: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserDB(UserSchema):
@@ -36,6 +54,19 @@ class LoginResponse(BaseModel):
     id: int
     message: str
     username: str
+    email: str
+    token: str
+    refresh_token: str
+
+
+class RefreshTokenIn(BaseModel):
+    refresh_token: str
+
+
+class TokenOut(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = 'bearer'
 
 
 class CompanySchema(BaseModel):
@@ -46,6 +77,10 @@ class CompanySchema(BaseModel):
     password: str
 
 
+class CompanyBulkCreate(BaseModel):
+    items: List[CompanySchema] = Field(max_length=5_000)
+
+
 class CompanyOut(BaseModel):
     id: int
     cnpj: str
@@ -53,8 +88,7 @@ class CompanyOut(BaseModel):
     email: str
     phone: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CompanyLogin(BaseModel):
@@ -75,8 +109,47 @@ class CursoEmpresaOut(BaseModel):
     description: str
     youtube_link: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CursoOut(CursoEmpresaOut):
+    company_id: int
+
+
+class CursoCreateOut(BaseModel):
+    message: str
+    # Mantido pelo contrato original: contém o id do curso criado
+    company_id: int
+
+
+class CourseStatsOut(BaseModel):
+    id: int
+    name: str
+    enrollment_count: int
+
+
+class CompanyStatsOut(BaseModel):
+    company_id: int
+    total_courses: int
+    total_enrollments: int
+    courses: List[CourseStatsOut]
+
+
+class RecommendationOut(CursoEmpresaOut):
+    # Alunos em comum entre este curso e os cursos do aluno
+    score: int
+
+
+class CursoImportError(BaseModel):
+    row: int
+    errors: List[dict]
+
+
+class CursoImportOut(BaseModel):
+    total: int
+    created: int
+    failed: int
+    errors: List[CursoImportError]
 
 
 class InscricaoCreate(BaseModel):
@@ -84,16 +157,66 @@ class InscricaoCreate(BaseModel):
     student_id: int
 
 
+class InscricaoOut(BaseModel):
+    message: str
+    enrollment_id: int
+
+
+class InscricaoBulkCreate(BaseModel):
+    items: List[InscricaoCreate] = Field(max_length=10_000)
+
+
+class InscricaoBulkItem(BaseModel):
+    student_id: int
+    course_id: int
+    status_code: int
+    detail: str
+    enrollment_id: Optional[int] = None
+
+
+class InscricaoBulkOut(BaseModel):
+    created: int
+    failed: int
+    results: List[InscricaoBulkItem]
+
+
 class CursoAlunoOut(BaseModel):
     id: int
     name: str
     description: str
     company_name: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Token(BaseModel):
     access_token: str
     token_type: str
+
+
+class HasherLatencyOut(BaseModel):
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+
+
+class PasswordHasherStatsOut(BaseModel):
+    executor: str
+    workers: int
+    max_queue: int
+    in_flight: int
+    queue_depth: int
+    completed: int
+    rejected: int
+    latency_ms: HasherLatencyOut
+
+
+class CacheStatsOut(BaseModel):
+    size: int
+    maxsize: int
+    ttl: Optional[float] = None
+    hits: int
+    misses: int
+    evictions: int
+    hit_ratio: float
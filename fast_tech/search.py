@@ -0,0 +1,56 @@
+import math
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import text
+
+from fast_tech.pagination import decode_cursor_position, encode_cursor
+
+SEARCH_SQL = """
+    SELECT cursos.id, cursos.name, cursos.description, cursos.youtube_link,
+           bm25(cursos_fts) AS score
+    FROM cursos_fts
+    JOIN cursos ON cursos.id = cursos_fts.rowid
+    WHERE cursos_fts MATCH :query {after}
+    ORDER BY score, cursos.id
+    LIMIT :limit
+"""
+
+AFTER_SQL = """
+    AND (bm25(cursos_fts) > :score
+         OR (bm25(cursos_fts) = :score AND cursos.id > :id))
+"""
+
+
+def fts_query(q: str) -> str:
+    # Cada termo vira uma frase entre aspas: o texto do usuário nunca é
+    # interpretado como sintaxe do FTS5 e os termos são combinados com AND.
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in q.split())
+
+
+async def search_courses(db, q: str, limit: int, after: Optional[str]):
+    query = fts_query(q)
+    if not query:
+        return {'items': [], 'next_cursor': None}
+
+    params = {'query': query, 'limit': limit + 1}
+    if after is not None:
+        position = decode_cursor_position(after)
+        # O bm25 é sempre float; NaN e infinito não vêm de um cursor válido
+        score = position.get('score')
+        if type(score) is not float or not math.isfinite(score):
+            raise HTTPException(status_code=400, detail='Cursor inválido.')
+        params.update(score=position['score'], id=position['id'])
+
+    sql = SEARCH_SQL.format(after=AFTER_SQL if after is not None else '')
+    rows = (await db.execute(text(sql), params)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].id, score=rows[-1].score)
+
+    return {
+        'items': [dict(row._mapping) for row in rows],
+        'next_cursor': next_cursor,
+    }
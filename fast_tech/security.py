@@ -1,14 +1,29 @@
+import hashlib
+import secrets
+import time
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
 from fastapi import Depends, HTTPException
-from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
+
+from fast_tech.cache import LRUCache
+from fast_tech.settings import settings
 
-SECRET_KEY = 'sua_chave_super_secreta'
 ALGORITHM = 'HS256'
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='token')
+export_key_scheme = APIKeyHeader(name='X-Export-Key', auto_error=False)
+
+# Claims já verificadas, por digest do token; cada entrada expira no `exp`
+token_cache = LRUCache(maxsize=settings.TOKEN_CACHE_SIZE)
+
+
+def _jwt():
+    # python-jose (e o backend de criptografia) só é importado no primeiro uso
+    from jose import jwt  # noqa: PLC0415
+
+    return jwt
 
 
 def create_access_token(data: dict):
@@ -18,17 +33,47 @@ def create_access_token(data: dict):
         minutes=ACCESS_TOKEN_EXPIRE_MINUTES
     )
     to_encode.update({'exp': expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    key_id = settings.JWT_ACTIVE_KEY_ID
+    encoded_jwt = _jwt().encode(
+        to_encode,
+        settings.JWT_KEYS[key_id],
+        algorithm=ALGORITHM,
+        headers={'kid': key_id},
+    )
     return encoded_jwt
 
 
 def decode_access_token(token: str):
+    digest = hashlib.sha256(token.encode()).digest()
+    cached = token_cache.get(digest)
+    if cached is not None:
+        key_id, key, payload = cached
+        # Só vale enquanto a chave que assinou o token continua no key set
+        if settings.JWT_KEYS.get(key_id) == key:
+            return payload
+
+    from jose import JWTError  # noqa: PLC0415
+
+    jwt = _jwt()
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError:
+        key_id = jwt.get_unverified_header(token).get(
+            'kid', settings.JWT_ACTIVE_KEY_ID
+        )
+        # O header ainda não foi verificado: um `kid` forjado pode ser
+        # lista ou objeto, que nem serve de chave no dict
+        if not isinstance(key_id, str):
+            return None
+        key = settings.JWT_KEYS[key_id]
+        payload = jwt.decode(token, key, algorithms=[ALGORITHM])
+    except (JWTError, KeyError):
         return None
 
+    if isinstance(payload.get('exp'), (int, float)):
+        token_cache.set(
+            digest, (key_id, key, payload), ttl=payload['exp'] - time.time()
+        )
+    return payload
+
 
 def get_current_student(token: str = Depends(oauth2_scheme)):
     payload = decode_access_token(token)
@@ -48,3 +93,16 @@ def get_current_company(token: str = Depends(oauth2_scheme)):
             detail='Acesso negado: apenas empresas autorizadas.',
         )
     return payload
+
+
+def require_export_key(key: str | None = Depends(export_key_scheme)):
+    expected = settings.EXPORT_API_KEY
+    if (
+        not expected
+        or not key
+        or not secrets.compare_digest(key.encode(), expected.encode())
+    ):
+        raise HTTPException(
+            status_code=403,
+            detail='Acesso negado: chave de exportação inválida.',
+        )
@@ -0,0 +1,275 @@
+"""Gera dados sintéticos em volume para testes de carga e capacidade.
+
+    python -m fast_tech.seed --users 100000 --courses 20000 \\
+        --enrollments 1000000 --database sqlite:///./carga.db
+
+Os dados são determinísticos para um mesmo `--seed`. Todos os usuários e
+empresas recebem o mesmo hash de `--password`, calculado uma única vez.
+"""
+
+import argparse
+import random
+import sys
+import time
+from itertools import islice
+
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.dialects import sqlite
+
+from fast_tech.cache import COURSES_SCOPE
+from fast_tech.db import to_sync_url
+from fast_tech.enrollments import repair_enrollment_counts
+from fast_tech.hashing import get_pwd_context
+from fast_tech.models import CatalogVersion, Company, Curso, Inscricao, User
+from fast_tech.recommendations import rebuild_recommendations
+from fast_tech.settings import settings
+from fast_tech.startup import create_schema
+
+SEED_BATCH_SIZE = 50_000
+SEED_PASSWORD = 'senha123'
+
+# Carga em lote: sem fsync e sem journal em disco. Um crash no meio do seed
+# pode corromper o banco, o que é aceitável para dados descartáveis.
+BULK_LOAD_PRAGMAS = (
+    'PRAGMA journal_mode=MEMORY',
+    'PRAGMA synchronous=OFF',
+    'PRAGMA locking_mode=EXCLUSIVE',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-262144',
+)
+
+FIRST_NAMES = (
+    'Ana', 'Bruno', 'Carla', 'Diego', 'Elisa', 'Felipe', 'Gabriela',
+    'Heitor', 'Isabela', 'João', 'Larissa', 'Marcos', 'Natália', 'Otávio',
+    'Paula', 'Rafael', 'Sofia', 'Thiago', 'Vitória', 'Yuri',
+)  # fmt: skip
+LAST_NAMES = (
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Lima', 'Pereira', 'Ferreira',
+    'Costa', 'Rodrigues', 'Almeida', 'Nascimento', 'Carvalho', 'Araújo',
+)  # fmt: skip
+TOPICS = (
+    'Python', 'JavaScript', 'Dados', 'Machine Learning', 'Redes', 'Cloud',
+    'Segurança', 'UX Design', 'Mobile', 'DevOps', 'SQL', 'Excel',
+)  # fmt: skip
+LEVELS = ('Introdução a', 'Fundamentos de', 'Prática de', 'Avançado em')
+
+
+def create_seed_engine(url: str):
+    engine = create_engine(to_sync_url(url))
+    if engine.dialect.name == 'sqlite':
+
+        @event.listens_for(engine, 'connect')
+        def _bulk_load_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in BULK_LOAD_PRAGMAS:
+                cursor.execute(pragma)
+            cursor.close()
+
+    return engine
+
+
+def _phone(rng) -> str:
+    return f'(11)9{rng.randrange(10**8):08d}'
+
+
+def generate_users(rng, first_id: int, total: int, password: str):
+    for user_id in range(first_id, first_id + total):
+        name = f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+        yield {
+            'id': user_id,
+            'name': name,
+            'username': f'aluno{user_id}',
+            'email': f'aluno{user_id}@exemplo.com',
+            'password': password,
+            'phone': _phone(rng),
+        }
+
+
+def generate_companies(rng, first_id: int, total: int, password: str):
+    for company_id in range(first_id, first_id + total):
+        yield {
+            'id': company_id,
+            'cnpj': f'{company_id:08d}0001{company_id % 100:02d}',
+            'username': f'empresa{company_id}',
+            'email': f'contato@empresa{company_id}.com',
+            'password': password,
+            'phone': _phone(rng),
+        }
+
+
+def generate_courses(rng, first_id: int, total: int, companies: range):
+    for course_id in range(first_id, first_id + total):
+        topic = rng.choice(TOPICS)
+        yield {
+            'id': course_id,
+            'name': f'{rng.choice(LEVELS)} {topic} {course_id}',
+            'description': (
+                f'Curso de {topic} com '
+                f'{rng.randint(4, 40)} aulas e projeto final.'
+            ),
+            'youtube_link': f'https://www.youtube.com/watch?v=c{course_id}',
+            'company_id': rng.choice(companies),
+        }
+
+
+def generate_enrollments(rng, total: int, users: range, courses: range):
+    # Distribui as inscrições igualmente entre os alunos; dentro de cada
+    # aluno os cursos de id menor são mais populares (popularidade
+    # quadrática). Em ordem de (aluno, curso), como o índice único.
+    per_user, extra = divmod(total, len(users))
+    per_user = min(per_user, len(courses))
+    for index, student_id in enumerate(users):
+        wanted = min(per_user + (index < extra), len(courses))
+        chosen = set()
+        while len(chosen) < wanted:
+            chosen.add(int(len(courses) * rng.random() ** 2))
+        for offset in sorted(chosen):
+            yield {'student_id': student_id, 'course_id': courses[offset]}
+
+
+def _next_id(conn, model) -> int:
+    return (conn.scalar(select(func.max(model.id))) or 0) + 1
+
+
+def load(conn, model, rows, total: int, batch_size: int):
+    started = time.perf_counter()
+    done = 0
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        conn.execute(insert(model), batch)
+        done += len(batch)
+        elapsed = time.perf_counter() - started
+        print(
+            f'\r{model.__tablename__}: {done:,}/{total:,} '
+            f'({done / elapsed:,.0f} linhas/s)',
+            end='',
+            file=sys.stderr,
+        )
+    if total:
+        print(file=sys.stderr)
+    return done
+
+
+def seed(
+    engine,
+    sizes: dict,
+    seed: int = 0,
+    batch_size: int = SEED_BATCH_SIZE,
+    password: str = SEED_PASSWORD,
+) -> dict:
+    rng = random.Random(seed)
+    hashed = get_pwd_context().hash(password)
+    with engine.begin() as conn:
+        create_schema(conn)
+
+    started = time.perf_counter()
+    # Uma transação por execução: o custo de commit é pago uma vez só
+    with engine.begin() as conn:
+        user_ids, company_ids, course_ids = (
+            range(first, first + sizes[name])
+            for name, first in (
+                ('users', _next_id(conn, User)),
+                ('companies', _next_id(conn, Company)),
+                ('courses', _next_id(conn, Curso)),
+            )
+        )
+        if sizes['courses'] and not company_ids:
+            raise ValueError('Cursos precisam de pelo menos uma empresa.')
+        if sizes['enrollments'] and not (user_ids and course_ids):
+            raise ValueError('Inscrições precisam de alunos e cursos.')
+
+        counts = {
+            'users': load(
+                conn,
+                User,
+                generate_users(rng, user_ids.start, len(user_ids), hashed),
+                len(user_ids),
+                batch_size,
+            ),
+            'companies': load(
+                conn,
+                Company,
+                generate_companies(
+                    rng, company_ids.start, len(company_ids), hashed
+                ),
+                len(company_ids),
+                batch_size,
+            ),
+            'courses': load(
+                conn,
+                Curso,
+                generate_courses(
+                    rng, course_ids.start, len(course_ids), company_ids
+                ),
+                len(course_ids),
+                batch_size,
+            ),
+            'enrollments': load(
+                conn,
+                Inscricao,
+                generate_enrollments(
+                    rng, sizes['enrollments'], user_ids, course_ids
+                ),
+                min(sizes['enrollments'], len(user_ids) * len(course_ids)),
+                batch_size,
+            ),
+        }
+
+        # Contadores de inscrições e índice de recomendações, em lote
+        conn.execute(repair_enrollment_counts())
+        rebuild_recommendations(conn)
+
+        # Invalida o catálogo em cache de instâncias da API já no ar
+        if counts['courses'] and engine.dialect.name == 'sqlite':
+            stmt = sqlite.insert(CatalogVersion).values(
+                scope=COURSES_SCOPE, version=1
+            )
+            conn.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[CatalogVersion.scope],
+                    set_={'version': CatalogVersion.version + 1},
+                )
+            )
+
+    if engine.dialect.name == 'sqlite':
+        with engine.connect() as conn:
+            conn.exec_driver_sql('ANALYZE')
+
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    print(
+        f'{total:,} linhas em {elapsed:.1f}s '
+        f'({total / elapsed:,.0f} linhas/s)',
+        file=sys.stderr,
+    )
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m fast_tech.seed')
+    parser.add_argument('--database', default=settings.DATABASE_URL)
+    parser.add_argument('--users', type=int, default=10_000)
+    parser.add_argument('--companies', type=int, default=100)
+    parser.add_argument('--courses', type=int, default=5_000)
+    parser.add_argument('--enrollments', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--batch-size', type=int, default=SEED_BATCH_SIZE)
+    parser.add_argument('--password', default=SEED_PASSWORD)
+    args = parser.parse_args(argv)
+
+    seed(
+        create_seed_engine(args.database),
+        {
+            'users': args.users,
+            'companies': args.companies,
+            'courses': args.courses,
+            'enrollments': args.enrollments,
+        },
+        seed=args.seed,
+        batch_size=args.batch_size,
+        password=args.password,
+    )
+
+
+if __name__ == '__main__':
+    main()
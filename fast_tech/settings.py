@@ -1,8 +1,84 @@
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
-    DATABASE_URL: str
+    DATABASE_URL: str = 'sqlite:///./test.db'
+    # Leituras (rotas GET): réplica em outros backends; sem valor, o SQLite
+    # abre o próprio DATABASE_URL em modo somente leitura
+    DATABASE_READ_URL: Optional[str] = None
+    # Após uma escrita o mesmo cliente lê do primário por esse tempo
+    READ_YOUR_WRITES_SECONDS: float = 5
+    # verify: exige o banco na revisão head do Alembic; create: create_all
+    # (desenvolvimento e testes); skip: não checa nada
+    SCHEMA_MODE: Literal['verify', 'create', 'skip'] = 'verify'
+    DB_POOL_SIZE: int = 8
+    DB_MAX_OVERFLOW: int = 8
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_WARMUP: int = 4
+    # Pragmas aplicados a cada conexão SQLite (ver fast_tech.db)
+    SQLITE_JOURNAL_MODE: str = 'WAL'
+    SQLITE_SYNCHRONOUS: str = 'NORMAL'
+    SQLITE_BUSY_TIMEOUT_MS: int = 5_000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    # Negativo: tamanho em KiB (-65536 = 64 MiB por conexão)
+    SQLITE_CACHE_SIZE: int = -65_536
+    SQLITE_TEMP_STORE: Literal['DEFAULT', 'FILE', 'MEMORY'] = 'MEMORY'
+    SQL_ECHO: bool = False
+    SLOW_QUERY_MS: float = 100
+    SLOW_QUERY_SAMPLE_RATE: float = 1.0
+
+    PASSWORD_HASHER_EXECUTOR: Literal['thread', 'process'] = 'thread'
+    PASSWORD_HASHER_WORKERS: Optional[int] = None
+    PASSWORD_HASHER_MAX_QUEUE: int = 64
+
+    # Controle de admissão: (concorrência, fila) por grupo de rotas; quem
+    # não cabe na fila ou espera mais que o timeout recebe 503
+    ADMISSION_CONTROL: bool = True
+    ADMISSION_LIMITS: dict[str, tuple[int, int]] = {
+        'auth': (4, 16),
+        'reads': (16, 64),
+        'writes': (8, 32),
+    }
+    ADMISSION_QUEUE_TIMEOUT: float = 1.0
+    ADMISSION_RETRY_AFTER: int = 1
+
+    # Group commit: inscrições avulsas vão para um único escritor que grava
+    # até MAX_ROWS por transação, esperando no máximo MAX_WAIT_MS por mais
+    ENROLLMENT_GROUP_COMMIT: bool = False
+    ENROLLMENT_BATCH_MAX_ROWS: int = 256
+    ENROLLMENT_BATCH_MAX_WAIT_MS: float = 2
+
+    CATALOG_CACHE_SIZE: int = 1024
+    CATALOG_CACHE_TTL: Optional[float] = None
+
+    # Vizinhos guardados por curso no índice de recomendações
+    RECOMMENDATION_NEIGHBORS: int = 20
+
+    # Limite de tentativas de login: (rajada, tentativas por minuto) por IP e
+    # por username; 'sqlite' compartilha o estado entre workers
+    LOGIN_THROTTLE_BACKEND: Literal['memory', 'sqlite'] = 'memory'
+    LOGIN_THROTTLE_SQLITE_PATH: str = './login_throttle.db'
+    LOGIN_RATE_PER_IP: tuple[int, float] = (20, 30)
+    LOGIN_RATE_PER_USERNAME: tuple[int, float] = (5, 5)
+    # Depois dessas falhas seguidas a espera começa em DELAY e dobra
+    LOGIN_FREE_FAILURES: int = 3
+    LOGIN_FAILURE_DELAY: float = 1
+    LOGIN_MAX_DELAY: float = 300
+
+    # Chaves de assinatura do JWT por `kid`; novos tokens usam a ativa
+    JWT_KEYS: dict[str, str] = {'default': 'sua_chave_super_secreta'}
+    JWT_ACTIVE_KEY_ID: str = 'default'
+    TOKEN_CACHE_SIZE: int = 10_000
+    # Refresh tokens opacos: renovam o JWT sem repetir o bcrypt do login
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # Duas abas renovando juntas: quem reapresenta o token trocado há menos
+    # disso ganha outro token da família em vez de revogar a sessão inteira
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS: float = 10
+    # /export devolve tabelas inteiras: só com o header X-Export-Key igual a
+    # esta chave; sem valor a rota fica desativada
+    EXPORT_API_KEY: Optional[str] = None
 
     class Config:
         env_file = '.env'
@@ -0,0 +1,108 @@
+import asyncio
+from pathlib import Path
+
+from sqlalchemy import inspect, text
+
+from fast_tech.db import Base, async_engine, async_read_engine
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / 'alembic.ini'
+# Revisão equivalente ao schema que o `create_all` da aplicação gerava antes
+# das migrations (users, companies, cursos e inscricoes_cursos)
+LEGACY_BASELINE = '77038036c823'
+
+
+def head_revision() -> str:
+    # Alembic só é importado aqui: o custo fica restrito à checagem do schema
+    from alembic.config import Config  # noqa: PLC0415
+    from alembic.script import ScriptDirectory  # noqa: PLC0415
+
+    return ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_current_head()
+
+
+def current_revision(connection):
+    from alembic.migration import MigrationContext  # noqa: PLC0415
+
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def stamp_revision(connection, revision: str):
+    """Registra a revisão no `alembic_version` sem rodar migrations."""
+    from alembic.config import Config  # noqa: PLC0415
+    from alembic.migration import MigrationContext  # noqa: PLC0415
+    from alembic.script import ScriptDirectory  # noqa: PLC0415
+
+    MigrationContext.configure(connection).stamp(
+        ScriptDirectory.from_config(Config(ALEMBIC_INI)), revision
+    )
+
+
+def create_schema(connection):
+    """Cria as tabelas que faltam; um banco vazio já nasce na head.
+
+    Sem o stamp, o `alembic upgrade head` tentaria recriar as tabelas que o
+    `create_all` acabou de gerar.
+    """
+    fresh = not inspect(connection).get_table_names()
+    Base.metadata.create_all(connection)
+    if fresh:
+        stamp_revision(connection, 'head')
+
+
+def adopt_legacy_database(connection) -> bool:
+    """Marca um banco anterior às migrations na revisão equivalente.
+
+    Chamado pelo `migrations/env.py` dentro da transação das migrations:
+    com isso `alembic upgrade head` leva bancos antigos (sem
+    `alembic_version`) até a head sem recriar tabelas, e um upgrade que
+    falha não deixa o stamp para trás.
+    """
+    inspector = inspect(connection)
+    # catalog_versions é a primeira tabela criada depois da baseline: se já
+    # existe, o schema veio do model atual e não é legado
+    legacy = (
+        inspector.has_table('users')
+        and not inspector.has_table('alembic_version')
+        and not inspector.has_table('catalog_versions')
+    )
+    if legacy:
+        stamp_revision(connection, LEGACY_BASELINE)
+    return legacy
+
+
+async def prepare_schema(mode: str):
+    """Confere o schema no startup sem nunca apagar dados.
+
+    `verify` exige que o banco esteja na revisão head do Alembic; `create`
+    cria apenas as tabelas que faltam (desenvolvimento e testes).
+    """
+    if mode == 'skip':
+        return
+
+    async with async_engine.begin() as conn:
+        if mode == 'create':
+            await conn.run_sync(create_schema)
+            return
+
+        current = await conn.run_sync(current_revision)
+
+    head = head_revision()
+    if current != head:
+        raise RuntimeError(
+            f'Banco na revisão {current}, esperado {head}: '
+            'execute `alembic upgrade head` antes de iniciar a API.'
+        )
+
+
+async def warm_pool(connections: int):
+    async def ping(db_engine):
+        async with db_engine.connect() as conn:
+            await conn.execute(text('SELECT 1'))
+
+    # Conexões abertas ao mesmo tempo para o pool guardar `connections` delas
+    await asyncio.gather(
+        *(
+            ping(db_engine)
+            for db_engine in {async_engine, async_read_engine}
+            for _ in range(connections)
+        )
+    )
@@ -0,0 +1,210 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from fast_tech.settings import settings
+
+# Estado por chave: (fichas, atualizado_em, falhas, bloqueado_até,
+# última_falha)
+EMPTY_STATE = (0.0, 0.0, 0, 0.0, 0.0)
+
+
+class MemoryThrottleStore:
+    """Estado do limitador no próprio processo, limitado por LRU."""
+
+    blocking = False
+
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, key: str, fn):
+        with self._lock:
+            state, result = fn(self._data.get(key, EMPTY_STATE))
+            self._data[key] = state
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return result
+
+
+class SQLiteThrottleStore:
+    """Estado num arquivo SQLite à parte, compartilhado entre workers.
+
+    Cada atualização é um BEGIN IMMEDIATE curto; o arquivo é separado do
+    banco principal para não disputar o lock de escrita com a aplicação.
+    """
+
+    # Transações com lock de arquivo: rodam fora do event loop
+    blocking = True
+    PRUNE_EVERY = 1_000
+    # Chaves sem uso há mais de um dia saem na limpeza periódica
+    RETENTION_SECONDS = 86_400
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(
+            path, timeout=1, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS login_throttle ('
+            'key TEXT PRIMARY KEY, tokens REAL, updated REAL, '
+            'failures INTEGER, blocked_until REAL, last_failure REAL)'
+        )
+        columns = {
+            row[1]
+            for row in self._conn.execute('PRAGMA table_info(login_throttle)')
+        }
+        if 'last_failure' not in columns:
+            self._conn.execute(
+                'ALTER TABLE login_throttle '
+                'ADD COLUMN last_failure REAL NOT NULL DEFAULT 0'
+            )
+        self._lock = threading.Lock()
+        self._updates = 0
+
+    def update(self, key: str, fn):
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._conn.execute(
+                    'SELECT tokens, updated, failures, blocked_until, '
+                    'last_failure FROM login_throttle WHERE key = ?',
+                    (key,),
+                ).fetchone()
+                state, result = fn(row or EMPTY_STATE)
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO login_throttle '
+                    '(key, tokens, updated, failures, blocked_until, '
+                    'last_failure) VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, *state),
+                )
+                self._updates += 1
+                if self._updates % self.PRUNE_EVERY == 0:
+                    cutoff = time.time() - self.RETENTION_SECONDS
+                    self._conn.execute(
+                        'DELETE FROM login_throttle '
+                        'WHERE updated < ? AND blocked_until < ?',
+                        (cutoff, cutoff),
+                    )
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            return result
+
+
+class LoginThrottle:
+    """Token bucket por username e por IP, com espera progressiva.
+
+    Cada tentativa gasta uma ficha do IP e uma do username; sem fichas, ou
+    dentro de um bloqueio, a tentativa é recusada antes de qualquer bcrypt.
+    Após `free_failures` falhas seguidas, cada nova falha bloqueia a chave
+    por `failure_delay` segundos, dobrando até `max_delay`. A contagem zera
+    quando a última falha tem mais de `max_delay` segundos, para que erros
+    esparsos num IP compartilhado não se acumulem para sempre.
+    """
+
+    def __init__(
+        self,
+        store,
+        rates: dict,
+        free_failures: int = 3,
+        delays: tuple[float, float] = (1.0, 300.0),
+    ):
+        self.store = store
+        self.rates = rates
+        self.free_failures = free_failures
+        self.failure_delay, self.max_delay = delays
+
+    @staticmethod
+    def _keys(scope: str, username: str, ip: str):
+        return (('ip', f'ip:{ip}'), ('username', f'{scope}:{username}'))
+
+    async def _run(self, fn, *args):
+        if self.store.blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def check(self, scope: str, username: str, ip: str) -> float:
+        """Gasta uma ficha; devolve 0 ou quantos segundos esperar."""
+        return await self._run(self._check, scope, username, ip)
+
+    async def failed(self, scope: str, username: str, ip: str):
+        await self._run(self._failed, scope, username, ip)
+
+    async def succeeded(self, scope: str, username: str):
+        await self._run(self._succeeded, scope, username)
+
+    def _check(self, scope: str, username: str, ip: str) -> float:
+        now = time.time()
+        for kind, key in self._keys(scope, username, ip):
+            burst, per_minute = self.rates[kind]
+            wait = self.store.update(
+                key,
+                lambda state: self._take(state, now, burst, per_minute / 60),
+            )
+            if wait:
+                return wait
+        return 0.0
+
+    @staticmethod
+    def _take(state, now, burst, rate):
+        tokens, updated, failures, blocked_until, last_failure = state
+        if blocked_until > now:
+            return state, blocked_until - now
+        tokens = min(burst, tokens + (now - updated) * rate)
+        if tokens < 1:
+            return (
+                (tokens, now, failures, blocked_until, last_failure),
+                (1 - tokens) / rate,
+            )
+        return (tokens - 1, now, failures, blocked_until, last_failure), 0.0
+
+    def _failed(self, scope: str, username: str, ip: str):
+        now = time.time()
+        for _, key in self._keys(scope, username, ip):
+            self.store.update(
+                key, lambda state: (self._fail(state, now), None)
+            )
+
+    def _fail(self, state, now):
+        tokens, updated, failures, blocked_until, last_failure = state
+        if now - last_failure > self.max_delay:
+            failures = 0
+        failures += 1
+        excess = failures - self.free_failures
+        if excess > 0:
+            delay = self.failure_delay * 2 ** (excess - 1)
+            blocked_until = now + min(delay, self.max_delay)
+        return tokens, updated, failures, blocked_until, now
+
+    def _succeeded(self, scope: str, username: str):
+        # Só a conta é liberada: um login válido não zera as falhas do IP
+        self.store.update(
+            f'{scope}:{username}',
+            lambda state: ((state[0], state[1], 0, 0.0, 0.0), None),
+        )
+
+
+def create_login_throttle() -> LoginThrottle:
+    if settings.LOGIN_THROTTLE_BACKEND == 'sqlite':
+        store = SQLiteThrottleStore(settings.LOGIN_THROTTLE_SQLITE_PATH)
+    else:
+        store = MemoryThrottleStore()
+    return LoginThrottle(
+        store,
+        {
+            'ip': settings.LOGIN_RATE_PER_IP,
+            'username': settings.LOGIN_RATE_PER_USERNAME,
+        },
+        free_failures=settings.LOGIN_FREE_FAILURES,
+        delays=(settings.LOGIN_FAILURE_DELAY, settings.LOGIN_MAX_DELAY),
+    )
+
+
+login_throttle = create_login_throttle()
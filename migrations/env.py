@@ -5,12 +5,17 @@ from sqlalchemy import pool
 
 from alembic import context
 
+from fast_tech.db import to_sync_url
 from fast_tech.models import Base
 from fast_tech.settings import Settings
+from fast_tech.startup import adopt_legacy_database
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
-config.set_main_option('sqlalchemy.url', Settings().DATABASE_URL)
+config.set_main_option(
+    'sqlalchemy.url',
+    to_sync_url(Settings().DATABASE_URL).render_as_string(hide_password=False),
+)
 
 
 # Interpret the config file for Python logging.
@@ -24,6 +29,12 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    # O índice FTS5 (cursos_fts e suas tabelas sombra) é mantido à mão
+    return not (type_ == 'table' and name.startswith('cursos_fts'))
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -46,6 +57,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -69,10 +81,14 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
+            # O stamp é gravado junto com a primeira migration
+            adopt_legacy_database(connection)
             context.run_migrations()
 
 
@@ -0,0 +1,35 @@
+"""add enrollment_count counter to cursos
+
+Revision ID: 41ac6cf8531f
+Revises: 4c3a32c68367
+Create Date: 2026-10-18 14:34:37.479362
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '41ac6cf8531f'
+down_revision: Union[str, None] = '4c3a32c68367'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cursos', sa.Column('enrollment_count', sa.Integer(), server_default='0', nullable=False))
+    # Preenche o contador com as inscrições já existentes
+    op.execute("""
+        UPDATE cursos SET enrollment_count = (
+            SELECT COUNT(*) FROM inscricoes_cursos
+            WHERE inscricoes_cursos.course_id = cursos.id
+        )
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('cursos', 'enrollment_count')
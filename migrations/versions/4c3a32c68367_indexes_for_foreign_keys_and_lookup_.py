@@ -0,0 +1,34 @@
+"""indexes for foreign keys and lookup columns
+
+Revision ID: 4c3a32c68367
+Revises: f506e87590e4
+Create Date: 2026-10-18 14:09:33.176880
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c3a32c68367'
+down_revision: Union[str, None] = 'f506e87590e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index(op.f('ix_cursos_id'), table_name='cursos')
+    op.drop_index(op.f('ix_inscricoes_cursos_id'), table_name='inscricoes_cursos')
+    op.create_index('ix_cursos_company_id_id', 'cursos', ['company_id', 'id'], unique=False)
+    op.create_index('ix_inscricoes_cursos_course_student', 'inscricoes_cursos', ['course_id', 'student_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_inscricoes_cursos_course_student', table_name='inscricoes_cursos')
+    op.drop_index('ix_cursos_company_id_id', table_name='cursos')
+    op.create_index(op.f('ix_inscricoes_cursos_id'), 'inscricoes_cursos', ['id'], unique=False)
+    op.create_index(op.f('ix_cursos_id'), 'cursos', ['id'], unique=False)
@@ -0,0 +1,93 @@
+"""align cursos with models and create inscricoes_cursos
+
+Revision ID: 5cbab49a2343
+Revises: f97378e0e4ca
+Create Date: 2026-10-18 14:04:29.412319
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5cbab49a2343'
+down_revision: Union[str, None] = 'f97378e0e4ca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Bancos criados pelo `create_all` da aplicação (antes das migrations)
+    # já têm `cursos` no formato do modelo e `inscricoes_cursos`; só a
+    # tabela de 77038036c823 (nome/descricao/empresa_id -> users) é refeita,
+    # copiando os cursos existentes.
+    inspector = sa.inspect(op.get_bind())
+    columns = {column['name'] for column in inspector.get_columns('cursos')}
+    if 'nome' in columns:
+        op.rename_table('cursos', 'cursos_legado')
+        op.drop_index(op.f('ix_cursos_id'), table_name='cursos_legado')
+        op.create_table('cursos',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.String(), nullable=False),
+        sa.Column('youtube_link', sa.String(), nullable=False),
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_cursos_id'), 'cursos', ['id'], unique=False)
+        op.execute("""
+            INSERT INTO cursos (id, name, description, youtube_link, company_id)
+            SELECT id, nome, descricao, youtube_link, empresa_id
+            FROM cursos_legado
+        """)
+        op.drop_table('cursos_legado')
+    elif 'ix_cursos_id' not in {
+        index['name'] for index in inspector.get_indexes('cursos')
+    }:
+        op.create_index(op.f('ix_cursos_id'), 'cursos', ['id'], unique=False)
+
+    if not inspector.has_table('inscricoes_cursos'):
+        op.create_table('inscricoes_cursos',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=True),
+        sa.Column('course_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['course_id'], ['cursos.id'], ),
+        sa.ForeignKeyConstraint(['student_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        indexes = set()
+    else:
+        indexes = {
+            index['name']
+            for index in inspector.get_indexes('inscricoes_cursos')
+        }
+    if 'ix_inscricoes_cursos_id' not in indexes:
+        op.create_index(op.f('ix_inscricoes_cursos_id'), 'inscricoes_cursos', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_inscricoes_cursos_id'), table_name='inscricoes_cursos')
+    op.drop_table('inscricoes_cursos')
+    op.drop_index(op.f('ix_cursos_id'), table_name='cursos')
+    op.rename_table('cursos', 'cursos_atual')
+    op.create_table('cursos',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nome', sa.String(), nullable=False),
+    sa.Column('descricao', sa.String(), nullable=False),
+    sa.Column('youtube_link', sa.String(), nullable=False),
+    sa.Column('empresa_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['empresa_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_cursos_id'), 'cursos', ['id'], unique=False)
+    op.execute("""
+        INSERT INTO cursos (id, nome, descricao, youtube_link, empresa_id)
+        SELECT id, name, description, youtube_link, company_id
+        FROM cursos_atual
+    """)
+    op.drop_table('cursos_atual')
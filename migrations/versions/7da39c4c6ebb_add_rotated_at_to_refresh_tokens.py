@@ -0,0 +1,28 @@
+"""add rotated_at to refresh tokens
+
+Revision ID: 7da39c4c6ebb
+Revises: 8827daa03001
+Create Date: 2026-10-18 15:41:25.801363
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7da39c4c6ebb'
+down_revision: Union[str, None] = '8827daa03001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('refresh_tokens', sa.Column('rotated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('refresh_tokens', 'rotated_at')
@@ -0,0 +1,65 @@
+"""create course recommendation index
+
+Revision ID: 9d3e7f21a6b4
+Revises: 41ac6cf8531f
+Create Date: 2026-10-18 16:02:11.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3e7f21a6b4'
+down_revision: Union[str, None] = '41ac6cf8531f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('course_cooccurrences',
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('similar_id', sa.Integer(), nullable=False),
+    sa.Column('shared', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['cursos.id'], ),
+    sa.ForeignKeyConstraint(['similar_id'], ['cursos.id'], ),
+    sa.PrimaryKeyConstraint('course_id', 'similar_id')
+    )
+    op.create_table('course_neighbors',
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('neighbor_id', sa.Integer(), nullable=False),
+    sa.Column('shared', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['cursos.id'], ),
+    sa.ForeignKeyConstraint(['neighbor_id'], ['cursos.id'], ),
+    sa.PrimaryKeyConstraint('course_id', 'neighbor_id')
+    )
+    # Monta o índice a partir das inscrições já existentes (top 20)
+    op.execute("""
+        INSERT INTO course_cooccurrences (course_id, similar_id, shared)
+        SELECT a.course_id, b.course_id, COUNT(*)
+        FROM inscricoes_cursos AS a
+        JOIN inscricoes_cursos AS b
+          ON b.student_id = a.student_id AND b.course_id != a.course_id
+        GROUP BY a.course_id, b.course_id
+    """)
+    op.execute("""
+        INSERT INTO course_neighbors (course_id, neighbor_id, shared)
+        SELECT course_id, similar_id, shared
+        FROM (
+            SELECT course_id, similar_id, shared,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY course_id ORDER BY shared DESC, similar_id
+                   ) AS position
+            FROM course_cooccurrences
+        ) AS ranked
+        WHERE position <= 20
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('course_neighbors')
+    op.drop_table('course_cooccurrences')
@@ -0,0 +1,36 @@
+"""unique enrollment per student and course
+
+Revision ID: f506e87590e4
+Revises: fb79293c4e2d
+Create Date: 2026-10-18 14:05:59.130022
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f506e87590e4'
+down_revision: Union[str, None] = 'fb79293c4e2d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Remove inscrições duplicadas (mantém a mais antiga) antes do índice único
+    op.execute("""
+        DELETE FROM inscricoes_cursos
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM inscricoes_cursos
+            GROUP BY student_id, course_id
+        )
+    """)
+    op.create_index('uq_inscricoes_cursos_student_course', 'inscricoes_cursos', ['student_id', 'course_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_inscricoes_cursos_student_course', table_name='inscricoes_cursos')
@@ -0,0 +1,32 @@
+"""create catalog_versions table
+
+Revision ID: f97378e0e4ca
+Revises: 77038036c823
+Create Date: 2026-10-18 14:03:10.403158
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f97378e0e4ca'
+down_revision: Union[str, None] = '77038036c823'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('catalog_versions',
+    sa.Column('scope', sa.String(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('scope')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('catalog_versions')
@@ -0,0 +1,59 @@
+"""create cursos_fts search index
+
+Revision ID: fb79293c4e2d
+Revises: 5cbab49a2343
+Create Date: 2026-10-18 14:04:31.504918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fb79293c4e2d'
+down_revision: Union[str, None] = '5cbab49a2343'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE VIRTUAL TABLE cursos_fts USING fts5(
+            name, description, content='cursos', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER cursos_fts_ai AFTER INSERT ON cursos BEGIN
+            INSERT INTO cursos_fts(rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER cursos_fts_ad AFTER DELETE ON cursos BEGIN
+            INSERT INTO cursos_fts(cursos_fts, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER cursos_fts_au AFTER UPDATE OF name, description ON cursos
+        BEGIN
+            INSERT INTO cursos_fts(cursos_fts, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+            INSERT INTO cursos_fts(rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END
+    """)
+    # Indexa os cursos que já existem
+    op.execute("INSERT INTO cursos_fts(cursos_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS cursos_fts_au')
+    op.execute('DROP TRIGGER IF EXISTS cursos_fts_ad')
+    op.execute('DROP TRIGGER IF EXISTS cursos_fts_ai')
+    op.execute('DROP TABLE IF EXISTS cursos_fts')
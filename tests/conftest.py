@@ -1,11 +1,26 @@
-# tests/conftest.py
-import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
-
-from fast_tech.app import app
-from fast_tech.db import Base
+import os
+import tempfile
+
+# Banco temporário por execução: os testes nunca tocam no test.db do projeto
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(
+    tempfile.mkdtemp(), 'test.db'
+)
+os.environ['SCHEMA_MODE'] = 'create'
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from fast_tech.app import app  # noqa: E402
+from fast_tech.db import Base, engine  # noqa: E402
+
+
+@pytest.fixture(scope='session', autouse=True)
+def database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
 
 
 @pytest.fixture
@@ -0,0 +1,91 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+
+from fast_tech.admission import (
+    AdmissionLimiter,
+    AdmissionRejectedError,
+    limiters,
+    route_group,
+)
+from fast_tech.app import app
+
+
+def test_queue_hands_slots_over_and_sheds_overflow():
+    limiter = AdmissionLimiter(limit=1, max_queue=1, queue_timeout=1)
+
+    async def scenario():
+        await limiter.acquire()
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejectedError):
+            await limiter.acquire()
+        limiter.release()
+        await queued
+        limiter.release()
+
+    asyncio.run(scenario())
+
+    assert limiter.stats() == {
+        'active': 0,
+        'queued': 0,
+        'admitted': 2,
+        'shed': 1,
+    }
+
+
+def test_queue_timeout_is_shed():
+    limiter = AdmissionLimiter(limit=1, max_queue=4, queue_timeout=0.01)
+
+    async def scenario():
+        await limiter.acquire()
+        with pytest.raises(AdmissionRejectedError):
+            await limiter.acquire()
+
+    asyncio.run(scenario())
+
+    assert limiter.stats()['queued'] == 0
+    assert limiter.stats()['shed'] == 1
+
+
+def test_routes_are_grouped_by_cost():
+    assert route_group('POST', '/login') == 'auth'
+    assert route_group('GET', '/courses') == 'reads'
+    assert route_group('POST', '/enrollments') == 'writes'
+    assert route_group('GET', '/metrics') is None
+    assert route_group('OPTIONS', '/courses') is None
+
+
+def test_full_group_answers_503_with_retry_after(monkeypatch):
+    monkeypatch.setitem(limiters, 'reads', AdmissionLimiter(0, 0, 0))
+    client = TestClient(app)
+
+    response = client.get('/courses')
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers['Retry-After'] == '1'
+    # Outros grupos e as métricas continuam atendendo
+    assert client.get('/metrics').status_code == HTTPStatus.OK
+    assert client.post('/login', json={}).status_code != (
+        HTTPStatus.SERVICE_UNAVAILABLE
+    )
+
+
+def test_shed_response_keeps_cors_and_is_measured(monkeypatch):
+    monkeypatch.setitem(limiters, 'reads', AdmissionLimiter(0, 0, 0))
+    client = TestClient(app)
+    origin = {'Origin': 'http://localhost:5173'}
+
+    response = client.get('/courses', headers=origin)
+    preflight = client.options(
+        '/courses',
+        headers={**origin, 'Access-Control-Request-Method': 'GET'},
+    )
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers['Access-Control-Allow-Origin'] == origin['Origin']
+    assert 'Server-Timing' in response.headers
+    assert preflight.status_code == HTTPStatus.OK
+    assert limiters['reads'].stats()['shed'] == 1
@@ -1,10 +1,26 @@
+import asyncio
+import base64
+import json
 import uuid
 from http import HTTPStatus
 
+import pytest
+from fastapi.routing import APIRoute
 from fastapi.testclient import TestClient
 from passlib.context import CryptContext
+from sqlalchemy import select, update
 
-from fast_tech.app import app
+from fast_tech.app import READ_YOUR_WRITES_COOKIE, app, get_db
+from fast_tech.course_import import INVALID_ENCODING
+from fast_tech.db import AsyncSessionLocal, engine
+from fast_tech.enrollments import EnrollmentWriter, repair_enrollment_counts
+from fast_tech.hashing import password_hasher
+from fast_tech.models import CourseNeighbor, Curso, User
+from fast_tech.recommendations import rebuild_recommendations
+from fast_tech.registration import USER_UNIQUE_FIELDS, register_many
+from fast_tech.schema import UserSchema
+from fast_tech.security import create_access_token, decode_access_token
+from fast_tech.settings import settings
 
 client = TestClient(app)
 pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
@@ -60,3 +76,759 @@ def test_create_company():
     assert 'id' in response_json
     assert response_json['username'] == unique_username
     assert response_json['email'] == unique_email
+
+
+def _create_company_with_courses(total):
+    unique_username = f'empresa_{uuid.uuid4().hex[:6]}'
+    company = client.post(
+        '/registerCompany',
+        json={
+            'cnpj': uuid.uuid4().hex[:14],
+            'username': unique_username,
+            'email': f'{unique_username}@test.com',
+            'phone': '(11)929038780',
+            'password': 'secret',
+        },
+    ).json()
+
+    for i in range(total):
+        client.post(
+            '/createCourses',
+            json={
+                'name': f'Curso {i}',
+                'description': 'Descrição',
+                'youtube_link': 'https://youtube.com/watch?v=x',
+                'company_id': company['id'],
+            },
+        )
+
+    return company['id']
+
+
+def test_list_company_courses_paginates_by_cursor():
+    company_id = _create_company_with_courses(5)
+
+    ids, cursor = [], None
+    while True:
+        params = {'limit': 2}
+        if cursor:
+            params['after'] = cursor
+        response = client.get(
+            f'/companies/{company_id}/courses', params=params
+        )
+        assert response.status_code == HTTPStatus.OK
+        page = response.json()
+        assert len(page['items']) <= 2  # noqa: PLR2004
+        ids.extend(item['id'] for item in page['items'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+
+    assert len(ids) == 5  # noqa: PLR2004
+    assert ids == sorted(ids)
+
+
+def _raw_cursor(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+@pytest.mark.parametrize(
+    'cursor',
+    [
+        'não-é-um-cursor',
+        _raw_cursor('{"id":1e400}'),
+        _raw_cursor('{"id":%d}' % 10**30),
+        _raw_cursor('{"id":true}'),
+        _raw_cursor('{"id":"1"}'),
+        _raw_cursor('[1]'),
+    ],
+)
+def test_list_courses_rejects_invalid_cursor(cursor):
+    response = client.get('/courses', params={'after': cursor})
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.parametrize('score', ['1e400', 'NaN', str(10**30), 'true'])
+def test_search_rejects_cursor_with_invalid_score(score):
+    cursor = _raw_cursor('{"id":1,"score":%s}' % score)
+
+    response = client.get(
+        '/courses/search', params={'q': 'python', 'after': cursor}
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.fixture
+def export_key(monkeypatch):
+    monkeypatch.setattr(settings, 'EXPORT_API_KEY', 'chave-de-teste')
+    return {'X-Export-Key': 'chave-de-teste'}
+
+
+def test_export_requires_key(export_key):
+    assert client.get('/export/users').status_code == HTTPStatus.FORBIDDEN
+    response = client.get('/export/users', headers={'X-Export-Key': 'outra'})
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_export_is_disabled_without_configured_key():
+    response = client.get('/export/users', headers={'X-Export-Key': ''})
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_export_users_ndjson_never_includes_password(export_key):
+    response = client.get('/export/users', headers=export_key)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows
+    assert all('password' not in row for row in rows)
+
+
+def test_export_courses_csv_with_projection(export_key):
+    _create_company_with_courses(2)
+
+    response = client.get(
+        '/export/courses',
+        params={'format': 'csv', 'columns': 'id,name'},
+        headers=export_key,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    lines = response.text.splitlines()
+    assert lines[0] == 'id,name'
+    assert len(lines) >= 3  # noqa: PLR2004
+
+
+def test_export_rejects_password_column(export_key):
+    response = client.get(
+        '/export/users',
+        params={'columns': 'id,password'},
+        headers=export_key,
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_company_catalog_is_cached_and_invalidated_on_create():
+    company_id = _create_company_with_courses(1)
+    url = f'/companies/{company_id}/courses'
+
+    first = client.get(url).json()
+    hits = client.get('/metrics/catalog-cache').json()['hits']
+    assert client.get(url).json() == first
+    assert client.get('/metrics/catalog-cache').json()['hits'] == hits + 1
+
+    client.post(
+        '/createCourses',
+        json={
+            'name': 'Curso novo',
+            'description': 'Descrição',
+            'youtube_link': 'https://youtube.com/watch?v=y',
+            'company_id': company_id,
+        },
+    )
+
+    assert len(client.get(url).json()['items']) == 2  # noqa: PLR2004
+
+
+def test_search_courses_ranks_and_paginates():
+    company_id = _create_company_with_courses(0)
+    for name, description in [
+        ('Introdução a Python', 'Aprenda python do zero'),
+        ('Python avançado', 'Python, python e mais python'),
+        ('Culinária', 'Receitas rápidas'),
+    ]:
+        client.post(
+            '/createCourses',
+            json={
+                'name': name,
+                'description': description,
+                'youtube_link': 'https://youtube.com/watch?v=z',
+                'company_id': company_id,
+            },
+        )
+
+    first = client.get('/courses/search', params={'q': 'python', 'limit': 1})
+    assert first.status_code == HTTPStatus.OK
+    assert first.json()['items'][0]['name'] == 'Python avançado'
+
+    second = client.get(
+        '/courses/search',
+        params={'q': 'python', 'after': first.json()['next_cursor']},
+    ).json()
+    names = [item['name'] for item in second['items']]
+    assert 'Introdução a Python' in names
+    assert 'Python avançado' not in names
+
+    acentos = client.get('/courses/search', params={'q': 'culinaria'})
+    assert [c['name'] for c in acentos.json()['items']] == ['Culinária']
+
+
+def _create_student():
+    unique_username = f'aluno_{uuid.uuid4().hex[:6]}'
+    return client.post(
+        '/registerStudent',
+        json={
+            'name': unique_username,
+            'username': unique_username,
+            'email': f'{unique_username}@test.com',
+            'phone': '(11)929038780',
+            'password': 'secret',
+        },
+    ).json()['id']
+
+
+def test_bulk_enrollment_reports_each_item():
+    student_id = _create_student()
+    company_id = _create_company_with_courses(2)
+    courses = client.get(f'/companies/{company_id}/courses').json()['items']
+    first, second = courses[0]['id'], courses[1]['id']
+
+    response = client.post(
+        '/enrollments/bulk',
+        json={
+            'items': [
+                {'student_id': student_id, 'course_id': first},
+                {'student_id': student_id, 'course_id': first},
+                {'student_id': student_id, 'course_id': second},
+                {'student_id': student_id, 'course_id': 999_999},
+                {'student_id': 999_999, 'course_id': first},
+            ]
+        },
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    body = response.json()
+    assert [r['status_code'] for r in body['results']] == [
+        HTTPStatus.CREATED,
+        HTTPStatus.CONFLICT,
+        HTTPStatus.CREATED,
+        HTTPStatus.NOT_FOUND,
+        HTTPStatus.NOT_FOUND,
+    ]
+    assert body['created'] == 2  # noqa: PLR2004
+
+    again = client.post(
+        '/enrollments', json={'student_id': student_id, 'course_id': first}
+    )
+    assert again.status_code == HTTPStatus.CONFLICT
+
+
+def test_bulk_course_import_reports_row_errors():
+    company_id = _create_company_with_courses(0)
+    rows = [
+        {
+            'name': 'Importado 1',
+            'description': 'd',
+            'youtube_link': 'y',
+            'company_id': company_id,
+        },
+        {'name': 'Sem descrição', 'youtube_link': 'y', 'company_id': 1},
+        {
+            'name': 'Empresa inexistente',
+            'description': 'd',
+            'youtube_link': 'y',
+            'company_id': 999_999,
+        },
+    ]
+    content = '\n'.join(json.dumps(row) for row in rows) + '\nnão é json\n'
+
+    response = client.post(
+        '/createCourses/bulk',
+        files={'file': ('cursos.ndjson', content, 'application/x-ndjson')},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    summary = response.json()
+    assert summary['total'] == 4  # noqa: PLR2004
+    assert summary['created'] == 1
+    assert [error['row'] for error in summary['errors']] == [2, 3, 4]
+    courses = client.get(f'/companies/{company_id}/courses').json()
+    assert [c['name'] for c in courses['items']] == ['Importado 1']
+
+
+def test_bulk_course_import_accepts_csv():
+    company_id = _create_company_with_courses(0)
+    content = 'name,description,youtube_link,company_id\n' + ''.join(
+        f'Curso CSV {i},d,y,{company_id}\n' for i in range(3)
+    )
+
+    response = client.post(
+        '/createCourses/bulk', files={'file': ('cursos.csv', content)}
+    )
+
+    assert response.json()['created'] == 3  # noqa: PLR2004
+
+
+def test_bulk_course_import_reports_lines_outside_utf8():
+    company_id = _create_company_with_courses(0)
+    # CSV exportado pelo Excel em cp1252: só a linha com acento é recusada
+    content = (
+        'name,description,youtube_link,company_id\n'
+        f'Curso 1,d,y,{company_id}\n'
+        f'Introdução,d,y,{company_id}\n'
+        f'Curso 3,d,y,{company_id}\n'
+    ).encode('cp1252')
+
+    response = client.post(
+        '/createCourses/bulk', files={'file': ('cursos.csv', content)}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    summary = response.json()
+    assert summary['created'] == 2  # noqa: PLR2004
+    assert summary['errors'] == [
+        {
+            'row': 2,
+            'errors': [{'field': None, 'msg': INVALID_ENCODING}],
+        }
+    ]
+
+
+def test_bulk_student_registration_checks_uniqueness():
+    prefix = uuid.uuid4().hex[:6]
+    students = [
+        {
+            'name': f'Aluno {i}',
+            'username': f'{prefix}_{i}',
+            'email': f'{prefix}_{i}@test.com',
+            'phone': '(11)929038780',
+            'password': 'secret',
+        }
+        for i in range(3)
+    ]
+    students.append({**students[0], 'email': f'{prefix}_outro@test.com'})
+
+    response = client.post('/registerStudent/bulk', json={'items': students})
+
+    assert response.status_code == HTTPStatus.OK
+    body = response.json()
+    assert body['created'] == 3  # noqa: PLR2004
+    assert body['results'][3]['detail'] == 'Username já existe'
+
+    login = client.post(
+        '/login', json={'username': f'{prefix}_1', 'password': 'secret'}
+    )
+    assert login.status_code == HTTPStatus.OK
+
+
+def test_bulk_registration_hashes_outside_read_transaction(monkeypatch):
+    prefix = uuid.uuid4().hex[:6]
+    students = [
+        UserSchema(
+            name='Aluno',
+            username=f'{prefix}_{i}',
+            email=f'{prefix}_{i}@test.com',
+            phone='(11)929038780',
+            password='secret',
+        )
+        for i in range(2)
+    ]
+    open_transactions = []
+
+    async def register():
+        async with AsyncSessionLocal() as db:
+            hash_many = password_hasher.hash_many
+
+            async def spy(passwords):
+                open_transactions.append(db.in_transaction())
+                return await hash_many(passwords)
+
+            monkeypatch.setattr(password_hasher, 'hash_many', spy)
+            return await register_many(db, User, students, USER_UNIQUE_FIELDS)
+
+    results = asyncio.run(register())
+
+    assert open_transactions == [False]
+    assert [r['status_code'] for r in results] == [HTTPStatus.CREATED] * 2
+
+
+def test_company_deletes_own_course():
+    company_id = _create_company_with_courses(1)
+    course_id = client.get(f'/companies/{company_id}/courses').json()['items'][
+        0
+    ]['id']
+    token = create_access_token({
+        'sub': 'empresa',
+        'role': 'company',
+        'id': company_id,
+    })
+
+    other = client.delete(
+        f'/companies/my-courses/{course_id}',
+        headers={
+            'Authorization': 'Bearer '
+            + create_access_token({'role': 'company', 'id': company_id + 1})
+        },
+    )
+    response = client.delete(
+        f'/companies/my-courses/{course_id}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert other.status_code == HTTPStatus.FORBIDDEN
+    assert response.status_code == HTTPStatus.NO_CONTENT
+    assert client.get(f'/courses/{course_id}').status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+
+def _dependencies(dependant):
+    for dependency in dependant.dependencies:
+        yield dependency.call
+        yield from _dependencies(dependency)
+
+
+def test_get_routes_use_read_only_sessions():
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or 'GET' not in route.methods:
+            continue
+        assert get_db not in set(_dependencies(route.dependant)), route.path
+
+
+def test_writes_pin_client_reads_to_primary():
+    company_id = _create_company_with_courses(1)
+    assert READ_YOUR_WRITES_COOKIE in client.cookies
+
+    response = client.get(f'/companies/{company_id}/courses')
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.json()['items']) == 1
+
+
+def test_course_detail_and_creation_follow_response_models():
+    company_id = _create_company_with_courses(0)
+    created = client.post(
+        '/createCourses',
+        json={
+            'name': 'Curso detalhado',
+            'description': 'Descrição',
+            'youtube_link': 'https://youtube.com/watch?v=d',
+            'company_id': company_id,
+        },
+    ).json()
+
+    course = client.get(f'/courses/{created["company_id"]}').json()
+
+    assert set(created) == {'message', 'company_id'}
+    assert course == {
+        'id': created['company_id'],
+        'name': 'Curso detalhado',
+        'description': 'Descrição',
+        'youtube_link': 'https://youtube.com/watch?v=d',
+        'company_id': company_id,
+    }
+
+
+def test_company_stats_follow_enrollments():
+    company_id = _create_company_with_courses(2)
+    first, second = (
+        course['id']
+        for course in client.get(f'/companies/{company_id}/courses').json()[
+            'items'
+        ]
+    )
+    students = [_create_student() for _ in range(3)]
+
+    client.post(
+        '/enrollments', json={'student_id': students[0], 'course_id': first}
+    )
+    client.post(
+        '/enrollments/bulk',
+        json={
+            'items': [
+                {'student_id': students[1], 'course_id': first},
+                {'student_id': students[2], 'course_id': first},
+                {'student_id': students[2], 'course_id': second},
+                # Duplicada: não conta de novo
+                {'student_id': students[0], 'course_id': first},
+            ]
+        },
+    )
+
+    stats = client.get(f'/companies/{company_id}/stats').json()
+
+    assert stats['total_courses'] == 2  # noqa: PLR2004
+    assert stats['total_enrollments'] == 4  # noqa: PLR2004
+    assert [c['enrollment_count'] for c in stats['courses']] == [3, 1]
+    assert client.get('/companies/999999/stats').status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+
+def test_repair_recomputes_drifted_enrollment_counts():
+    company_id = _create_company_with_courses(1)
+    course_id = client.get(f'/companies/{company_id}/courses').json()['items'][
+        0
+    ]['id']
+    client.post(
+        '/enrollments',
+        json={'student_id': _create_student(), 'course_id': course_id},
+    )
+    with engine.begin() as conn:
+        conn.execute(
+            update(Curso)
+            .where(Curso.id == course_id)
+            .values(enrollment_count=42)
+        )
+        repaired = conn.execute(repair_enrollment_counts()).rowcount
+
+    stats = client.get(f'/companies/{company_id}/stats').json()
+
+    assert repaired == 1
+    assert stats['courses'][0]['enrollment_count'] == 1
+
+
+def _course_ids(company_id):
+    return [
+        course['id']
+        for course in client.get(f'/companies/{company_id}/courses').json()[
+            'items'
+        ]
+    ]
+
+
+def test_recommendations_rank_co_enrolled_courses():
+    first, second, third, fourth = _course_ids(_create_company_with_courses(4))
+    students = [_create_student() for _ in range(3)]
+    target = _create_student()
+    client.post(
+        '/enrollments/bulk',
+        json={
+            'items': [
+                {'student_id': students[0], 'course_id': first},
+                {'student_id': students[0], 'course_id': second},
+                {'student_id': students[0], 'course_id': third},
+                {'student_id': students[1], 'course_id': first},
+                {'student_id': students[1], 'course_id': second},
+                {'student_id': students[2], 'course_id': first},
+                {'student_id': students[2], 'course_id': fourth},
+            ]
+        },
+    )
+    client.post(
+        '/enrollments', json={'student_id': target, 'course_id': first}
+    )
+
+    response = client.get(f'/students/{target}/recommendations')
+    limited = client.get(
+        f'/students/{target}/recommendations', params={'limit': 1}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    # O curso já feito fica de fora; empates saem pelo menor id
+    assert [(c['id'], c['score']) for c in response.json()] == [
+        (second, 2),
+        (third, 1),
+        (fourth, 1),
+    ]
+    assert [c['id'] for c in limited.json()] == [second]
+    assert client.get('/students/999999/recommendations').status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+
+def test_incremental_neighbors_match_full_rebuild(monkeypatch):
+    # K pequeno para forçar trocas no top-K durante as inscrições
+    monkeypatch.setattr(settings, 'RECOMMENDATION_NEIGHBORS', 2)
+    courses = _course_ids(_create_company_with_courses(5))
+    students = [_create_student() for _ in range(4)]
+    taken = [
+        (0, 0), (0, 1), (1, 2), (1, 3), (2, 3), (2, 4), (3, 4), (3, 0),
+    ]  # fmt: skip
+    for student, course in taken:
+        client.post(
+            '/enrollments',
+            json={
+                'student_id': students[student],
+                'course_id': courses[course],
+            },
+        )
+    client.post(
+        '/enrollments/bulk',
+        json={
+            'items': [
+                {'student_id': students[3], 'course_id': course_id}
+                for course_id in courses[1:4]
+            ]
+        },
+    )
+    neighbors = select(
+        CourseNeighbor.course_id,
+        CourseNeighbor.neighbor_id,
+        CourseNeighbor.shared,
+    ).where(CourseNeighbor.course_id.in_(courses))
+
+    with engine.connect() as conn:
+        incremental = set(conn.execute(neighbors))
+        rebuild_recommendations(conn)
+        rebuilt = set(conn.execute(neighbors))
+        conn.rollback()
+
+    assert incremental == rebuilt
+    assert len(rebuilt) == 2 * len(courses)
+
+
+def test_enrollment_writer_commits_concurrent_requests_in_batches():
+    student_ids = [_create_student() for _ in range(3)]
+    first, second = _course_ids(_create_company_with_courses(2))
+    pairs = [
+        (student_id, course_id)
+        for student_id in student_ids
+        for course_id in (first, second)
+    ]
+    # Repetida e curso inexistente: mesmos erros da rota sem lote
+    pairs += [(student_ids[0], first), (student_ids[0], 999999)]
+
+    async def enroll():
+        writer = EnrollmentWriter(max_rows=4, max_wait=0.05)
+        try:
+            return await asyncio.gather(
+                *(writer.submit(*pair) for pair in pairs)
+            ), writer.stats()
+        finally:
+            await writer.stop()
+
+    results, stats = asyncio.run(enroll())
+
+    assert [r['status_code'] for r in results] == [HTTPStatus.CREATED] * 6 + [
+        HTTPStatus.CONFLICT,
+        HTTPStatus.NOT_FOUND,
+    ]
+    assert len({r['enrollment_id'] for r in results[:6]}) == 6  # noqa: PLR2004
+    assert stats['rows'] == len(pairs)
+    assert stats['batches'] == 2  # noqa: PLR2004
+
+
+def test_group_commit_mode_keeps_enrollment_responses(monkeypatch):
+    monkeypatch.setattr(settings, 'ENROLLMENT_GROUP_COMMIT', True)
+    student_id = _create_student()
+    (course_id,) = _course_ids(_create_company_with_courses(1))
+    enrollment = {'student_id': student_id, 'course_id': course_id}
+
+    with TestClient(app) as batched:
+        created = batched.post('/enrollments', json=enrollment)
+        duplicate = batched.post('/enrollments', json=enrollment)
+        missing = batched.post(
+            '/enrollments', json={**enrollment, 'course_id': 999999}
+        )
+
+    assert created.status_code == HTTPStatus.CREATED
+    assert created.json()['message'] == 'Inscrição realizada com sucesso'
+    assert duplicate.status_code == HTTPStatus.CONFLICT
+    assert duplicate.json()['detail'] == 'Aluno já está inscrito nesse curso.'
+    assert missing.status_code == HTTPStatus.NOT_FOUND
+    assert missing.json()['detail'] == 'Curso não encontrado.'
+
+
+def _student_login():
+    username = f'aluno_{uuid.uuid4().hex[:6]}'
+    student_id = client.post(
+        '/registerStudent',
+        json={
+            'name': username,
+            'username': username,
+            'email': f'{username}@test.com',
+            'phone': '(11)929038780',
+            'password': 'secret',
+        },
+    ).json()['id']
+    login = client.post(
+        '/login', json={'username': username, 'password': 'secret'}
+    ).json()
+    return student_id, login
+
+
+def _refresh(token):
+    return client.post('/token/refresh', json={'refresh_token': token})
+
+
+def test_refresh_token_rotates_and_detects_reuse(monkeypatch):
+    monkeypatch.setattr(settings, 'REFRESH_TOKEN_REUSE_GRACE_SECONDS', 0)
+    student_id, login = _student_login()
+
+    refreshed = client.post(
+        '/token/refresh', json={'refresh_token': login['refresh_token']}
+    )
+    reused = client.post(
+        '/token/refresh', json={'refresh_token': login['refresh_token']}
+    )
+    after_reuse = client.post(
+        '/token/refresh',
+        json={'refresh_token': refreshed.json()['refresh_token']},
+    )
+
+    assert decode_access_token(login['token'])['id'] == student_id
+    assert refreshed.status_code == HTTPStatus.OK
+    claims = decode_access_token(refreshed.json()['access_token'])
+    assert (claims['role'], claims['id']) == ('student', student_id)
+    assert refreshed.json()['refresh_token'] != login['refresh_token']
+    # Token já trocado de novo: a família inteira é revogada
+    assert reused.status_code == HTTPStatus.UNAUTHORIZED
+    assert after_reuse.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_concurrent_refresh_within_grace_keeps_the_session():
+    _, login = _student_login()
+
+    # Duas abas com o mesmo token: a segunda chega depois da troca
+    first = _refresh(login['refresh_token'])
+    second = _refresh(login['refresh_token'])
+
+    assert first.status_code == second.status_code == HTTPStatus.OK
+    assert first.json()['refresh_token'] != second.json()['refresh_token']
+    # Os dois sucessores continuam valendo
+    assert _refresh(first.json()['refresh_token']).status_code == (
+        HTTPStatus.OK
+    )
+    assert _refresh(second.json()['refresh_token']).status_code == (
+        HTTPStatus.OK
+    )
+
+
+def test_reuse_after_logout_is_rejected_even_within_grace():
+    _, login = _student_login()
+    refreshed = _refresh(login['refresh_token']).json()
+
+    client.post(
+        '/token/revoke', json={'refresh_token': refreshed['refresh_token']}
+    )
+
+    assert _refresh(login['refresh_token']).status_code == (
+        HTTPStatus.UNAUTHORIZED
+    )
+
+
+def test_company_login_issues_revocable_tokens():
+    unique_username = f'empresa_{uuid.uuid4().hex[:6]}'
+    company_id = client.post(
+        '/registerCompany',
+        json={
+            'cnpj': uuid.uuid4().hex[:14],
+            'username': unique_username,
+            'email': f'{unique_username}@test.com',
+            'phone': '(11)929038780',
+            'password': 'secret',
+        },
+    ).json()['id']
+    login = client.post(
+        '/companyLogin',
+        json={'username': unique_username, 'password': 'secret'},
+    ).json()
+
+    revoked = client.post(
+        '/token/revoke', json={'refresh_token': login['refresh_token']}
+    )
+    refreshed = client.post(
+        '/token/refresh', json={'refresh_token': login['refresh_token']}
+    )
+
+    claims = decode_access_token(login['token'])
+    assert (claims['role'], claims['id']) == ('company', company_id)
+    assert revoked.status_code == HTTPStatus.NO_CONTENT
+    assert refreshed.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,28 @@
+from benchmarks.runner import compare, summarize
+
+
+def test_summarize_counts_unexpected_statuses_as_errors():
+    result = summarize([0.01, 0.02, 0.03, 0.04], {201: 3, 500: 1}, {201}, 2)
+
+    assert result['requests'] == 4  # noqa: PLR2004
+    assert result['errors'] == 1
+    assert result['status_codes'] == {'201': 3, '500': 1}
+    assert result['throughput_rps'] == 2  # noqa: PLR2004
+    assert result['p50_ms'] == 30  # noqa: PLR2004
+
+
+def test_compare_flags_only_changes_beyond_tolerance():
+    baseline = {
+        'GET /courses': {'p95_ms': 10, 'throughput_rps': 100, 'errors': 0},
+        'GET /usuarios': {'p95_ms': 10, 'throughput_rps': 100, 'errors': 0},
+    }
+    current = {
+        'GET /courses': {'p95_ms': 11, 'throughput_rps': 95, 'errors': 0},
+        'GET /usuarios': {'p95_ms': 20, 'throughput_rps': 50, 'errors': 2},
+        'GET /metrics': {'p95_ms': 1, 'throughput_rps': 1, 'errors': 0},
+    }
+
+    regressions = compare(current, baseline, tolerance=0.2)
+
+    assert len(regressions) == 3  # noqa: PLR2004
+    assert all(item.startswith('GET /usuarios') for item in regressions)
@@ -1,6 +1,10 @@
-from sqlalchemy import select
+import pytest
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.exc import OperationalError
 
+from fast_tech.db import Base, create_db_engine
 from fast_tech.models import User
+from fast_tech.settings import settings
 
 
 def test_create_user(session):
@@ -21,3 +25,41 @@ def test_create_user(session):
     assert user is not None
     assert user.username == 'testuser'
     assert user.email == 'test@example.com'
+
+
+def test_sqlite_engine_applies_pragmas(tmp_path):
+    db_engine = create_db_engine(f'sqlite:///{tmp_path / "pragmas.db"}')
+
+    with db_engine.connect() as conn:
+        journal_mode = conn.exec_driver_sql('PRAGMA journal_mode').scalar()
+        busy_timeout = conn.exec_driver_sql('PRAGMA busy_timeout').scalar()
+
+    assert journal_mode == 'wal'
+    assert busy_timeout == settings.SQLITE_BUSY_TIMEOUT_MS
+    db_engine.dispose()
+
+
+def test_read_only_engine_reads_while_writer_is_open(tmp_path):
+    url = f'sqlite:///{tmp_path / "wal.db"}'
+    writer = create_db_engine(url)
+    reader = create_db_engine(url, read_only=True)
+    Base.metadata.create_all(writer)
+
+    with writer.connect() as write_conn, reader.connect() as read_conn:
+        write_conn.execute(
+            insert(User).values(
+                name='Leitor',
+                username='leitor',
+                email='leitor@example.com',
+                phone='(11)99999-9999',
+                password='secret',
+            )
+        )
+        # Sem commit: no WAL o leitor segue vendo o snapshot anterior
+        assert read_conn.scalar(select(func.count(User.id))) == 0
+
+        with pytest.raises(OperationalError, match='readonly'):
+            read_conn.execute(delete(User))
+
+    writer.dispose()
+    reader.dispose()
@@ -0,0 +1,49 @@
+import asyncio
+import threading
+
+import pytest
+
+from fast_tech import hashing
+from fast_tech.hashing import HasherBusyError, PasswordHasher
+
+
+def test_hash_and_verify_run_in_pool():
+    hasher = PasswordHasher(max_workers=2)
+
+    hashed = asyncio.run(hasher.hash('secret'))
+
+    assert asyncio.run(hasher.verify('secret', hashed))
+    assert not asyncio.run(hasher.verify('wrong', hashed))
+    stats = hasher.stats()
+    assert stats['completed'] == 3  # noqa: PLR2004
+    assert stats['queue_depth'] == 0
+    hasher.shutdown()
+
+
+def test_full_queue_is_rejected(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(
+        hashing, '_hash', lambda password: release.wait() and password
+    )
+    hasher = PasswordHasher(max_workers=1, max_queue=1)
+
+    async def scenario():
+        # Um hash ocupa o worker e outro a única vaga da fila
+        blocked = [
+            asyncio.create_task(hasher.hash('secret')) for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        stats = hasher.stats()
+        with pytest.raises(HasherBusyError):
+            await hasher.hash('secret')
+        release.set()
+        await asyncio.gather(*blocked)
+        return stats
+
+    stats = asyncio.run(scenario())
+
+    assert stats['in_flight'] == 1
+    assert stats['queue_depth'] == 1
+    assert hasher.stats()['rejected'] == 1
+    assert hasher.stats()['completed'] == 2  # noqa: PLR2004
+    hasher.shutdown()
@@ -0,0 +1,61 @@
+import logging
+import uuid
+
+from fast_tech.settings import settings
+
+
+def test_server_timing_reports_request_queries(client):
+    response = client.get('/courses')
+
+    assert response.status_code == 200  # noqa: PLR2004
+    db, total = response.headers['Server-Timing'].split(', ')
+    assert db.startswith('db;desc="')
+    assert 'queries' in db
+    assert total.startswith('total;dur=')
+
+
+def test_metrics_exposes_route_histograms(client):
+    client.get('/courses')
+
+    body = client.get('/metrics').text
+
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/courses"}'
+        in body
+    )
+    assert (
+        'http_request_db_queries_total{method="GET",route="/courses"}' in body
+    )
+    assert '# TYPE db_slow_queries_total counter' in body
+    assert 'catalog_cache_hits' in body
+
+
+def test_slow_queries_are_logged(client, monkeypatch, caplog):
+    monkeypatch.setattr(settings, 'SLOW_QUERY_MS', 0)
+
+    with caplog.at_level(logging.WARNING, logger='fast_tech.sql'):
+        client.get('/courses')
+
+    assert any('Consulta lenta' in r.message for r in caplog.records)
+
+
+def test_slow_query_log_omits_bound_values(client, monkeypatch, caplog):
+    monkeypatch.setattr(settings, 'SLOW_QUERY_MS', 0)
+    username = f'log_{uuid.uuid4().hex[:6]}'
+
+    with caplog.at_level(logging.WARNING, logger='fast_tech.sql'):
+        client.post(
+            '/registerStudent',
+            json={
+                'name': username,
+                'username': username,
+                'email': f'{username}@test.com',
+                'phone': '(11)929038780',
+                'password': 'secret',
+            },
+        )
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert any('INSERT INTO users' in message for message in messages)
+    assert not any(username in message for message in messages)
+    assert not any('$2b$' in message for message in messages)
@@ -0,0 +1,158 @@
+import uuid
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from fast_tech.app import app
+from fast_tech.cache import catalog_cache
+from fast_tech.db import async_engine, async_read_engine, engine
+from fast_tech.pagination import encode_cursor
+
+client = TestClient(app)
+
+
+@contextmanager
+def captured_selects():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, *args):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    engines = {async_engine.sync_engine, async_read_engine.sync_engine}
+    for db_engine in engines:
+        event.listen(db_engine, 'before_cursor_execute', capture)
+    try:
+        yield statements
+    finally:
+        for db_engine in engines:
+            event.remove(db_engine, 'before_cursor_execute', capture)
+
+
+def full_scans(statement, parameters):
+    with engine.connect() as conn:
+        plan = conn.exec_driver_sql(
+            f'EXPLAIN QUERY PLAN {statement}', parameters
+        ).all()
+    return [
+        row.detail
+        for row in plan
+        if row.detail.startswith('SCAN')
+        and 'INDEX' not in row.detail
+        and 'VIRTUAL TABLE' not in row.detail
+    ]
+
+
+@pytest.fixture(scope='module')
+def dataset():
+    suffix = uuid.uuid4().hex[:6]
+    student = client.post(
+        '/registerStudent',
+        json={
+            'name': 'Plano',
+            'username': f'plano_{suffix}',
+            'email': f'plano_{suffix}@test.com',
+            'phone': '(11)929038780',
+            'password': 'secret',
+        },
+    ).json()
+    company = client.post(
+        '/registerCompany',
+        json={
+            'cnpj': f'plano_{suffix}',
+            'username': f'plano_{suffix}',
+            'email': f'plano_{suffix}@test.com',
+            'phone': '(11)929038780',
+            'password': 'secret',
+        },
+    ).json()
+    course_id = client.post(
+        '/createCourses',
+        json={
+            'name': 'Índices no SQLite',
+            'description': 'Planos de consulta',
+            'youtube_link': 'https://youtube.com/watch?v=p',
+            'company_id': company['id'],
+        },
+    ).json()['company_id']
+    client.post(
+        '/enrollments',
+        json={'student_id': student['id'], 'course_id': course_id},
+    )
+    return {
+        'student': student,
+        'company_id': company['id'],
+        'course_id': course_id,
+    }
+
+
+@pytest.mark.parametrize(
+    ('method', 'url', 'body'),
+    [
+        ('GET', '/usuarios?after={cursor}', None),
+        ('GET', '/courses?after={cursor}', None),
+        ('GET', '/companies/{company_id}/courses', None),
+        ('GET', '/courses/{course_id}', None),
+        ('GET', '/courses/search?q=consulta', None),
+        ('GET', '/students/my-courses?user_id={student_id}', None),
+        ('POST', '/login', 'login'),
+        ('POST', '/enrollments/bulk', 'bulk'),
+    ],
+)
+def test_endpoint_queries_use_indexes(dataset, method, url, body):
+    student = dataset['student']
+    url = url.format(
+        cursor=encode_cursor(0),
+        company_id=dataset['company_id'],
+        course_id=dataset['course_id'],
+        student_id=student['id'],
+    )
+    payload = {
+        'login': {'username': student['username'], 'password': 'secret'},
+        'bulk': {
+            'items': [
+                {
+                    'student_id': student['id'],
+                    'course_id': dataset['course_id'],
+                }
+            ]
+        },
+    }.get(body)
+    catalog_cache.clear()
+
+    with captured_selects() as statements:
+        response = client.request(method, url, json=payload)
+
+    assert response.status_code < 400  # noqa: PLR2004
+    assert statements
+    for statement, parameters in statements:
+        assert full_scans(statement, parameters) == [], statement
+
+
+@pytest.mark.parametrize(
+    'url',
+    [
+        '/usuarios',
+        '/courses',
+        '/companies/{company_id}/courses',
+        '/students/my-courses?user_id={student_id}',
+    ],
+)
+def test_listings_select_only_response_columns(dataset, url):
+    url = url.format(
+        company_id=dataset['company_id'],
+        student_id=dataset['student']['id'],
+    )
+    catalog_cache.clear()
+
+    with captured_selects() as statements:
+        response = client.get(url)
+
+    assert response.status_code == 200  # noqa: PLR2004
+    listing = [sql for sql, _ in statements if 'catalog_versions' not in sql]
+    assert listing
+    for statement in listing:
+        assert 'password' not in statement
+        assert 'company_id' not in statement.split('FROM')[0]
@@ -0,0 +1,45 @@
+from jose import jwt
+
+from fast_tech.security import (
+    ALGORITHM,
+    create_access_token,
+    decode_access_token,
+    token_cache,
+)
+from fast_tech.settings import settings
+
+
+def test_decoded_token_is_served_from_cache():
+    token = create_access_token({'sub': 'aluno', 'role': 'student', 'id': 1})
+    hits = token_cache.hits
+
+    assert decode_access_token(token)['sub'] == 'aluno'
+    assert decode_access_token(token)['sub'] == 'aluno'
+
+    assert token_cache.hits == hits + 1
+
+
+def test_cached_token_is_rejected_after_key_rotation(monkeypatch):
+    token = create_access_token({'sub': 'empresa', 'role': 'company'})
+    assert decode_access_token(token) is not None
+
+    monkeypatch.setattr(settings, 'JWT_KEYS', {'nova': 'outra-chave'})
+    monkeypatch.setattr(settings, 'JWT_ACTIVE_KEY_ID', 'nova')
+
+    assert decode_access_token(token) is None
+    assert decode_access_token(create_access_token({'sub': 'x'}))['sub'] == 'x'
+
+
+def test_invalid_token_is_rejected():
+    assert decode_access_token('não.é.jwt') is None
+
+
+def test_token_with_non_string_kid_is_rejected():
+    token = jwt.encode(
+        {'sub': 'x'},
+        settings.JWT_KEYS[settings.JWT_ACTIVE_KEY_ID],
+        algorithm=ALGORITHM,
+        headers={'kid': ['default']},
+    )
+
+    assert decode_access_token(token) is None
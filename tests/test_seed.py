@@ -0,0 +1,67 @@
+from sqlalchemy import func, select
+
+from fast_tech.models import Company, Curso, Inscricao, User
+from fast_tech.seed import create_seed_engine, seed
+from fast_tech.startup import current_revision, head_revision
+
+SIZES = {'users': 30, 'companies': 3, 'courses': 20, 'enrollments': 100}
+
+
+def _snapshot(engine):
+    with engine.connect() as conn:
+        return (
+            conn.execute(select(Curso.company_id).order_by(Curso.id)).all(),
+            conn.execute(
+                select(Inscricao.student_id, Inscricao.course_id).order_by(
+                    Inscricao.id
+                )
+            ).all(),
+        )
+
+
+def test_seed_is_deterministic_and_referentially_valid(tmp_path):
+    engines = [
+        create_seed_engine(f'sqlite:///{tmp_path / f"seed{i}.db"}')
+        for i in range(2)
+    ]
+    counts = [seed(engine, SIZES, seed=7) for engine in engines]
+
+    assert counts[0] == counts[1] == SIZES
+    assert _snapshot(engines[0]) == _snapshot(engines[1])
+
+    with engines[0].connect() as conn:
+        orphans = conn.scalar(
+            select(func.count())
+            .select_from(Inscricao)
+            .outerjoin(User, User.id == Inscricao.student_id)
+            .outerjoin(Curso, Curso.id == Inscricao.course_id)
+            .where((User.id.is_(None)) | (Curso.id.is_(None)))
+        )
+        companies = conn.scalar(select(func.count()).select_from(Company))
+
+    assert orphans == 0
+    assert companies == SIZES['companies']
+    for engine in engines:
+        engine.dispose()
+
+
+def test_seed_appends_after_existing_rows(tmp_path):
+    engine = create_seed_engine(f'sqlite:///{tmp_path / "seed.db"}')
+    seed(engine, SIZES)
+    seed(engine, SIZES, seed=1)
+
+    with engine.connect() as conn:
+        users = conn.scalar(select(func.count()).select_from(User))
+
+    assert users == 2 * SIZES['users']
+    engine.dispose()
+
+
+def test_seed_stamps_fresh_database_at_head(tmp_path):
+    engine = create_seed_engine(f'sqlite:///{tmp_path / "seed.db"}')
+    seed(engine, SIZES)
+    seed(engine, SIZES, seed=1)
+
+    with engine.connect() as conn:
+        assert current_revision(conn) == head_revision()
+    engine.dispose()
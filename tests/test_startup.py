@@ -0,0 +1,110 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from fast_tech.app import create_app
+from fast_tech.db import Base
+from fast_tech.settings import settings
+from fast_tech.startup import ALEMBIC_INI, create_schema, head_revision
+
+
+def test_lifespan_reports_startup_timings():
+    with TestClient(create_app()) as client:
+        timings = client.get('/metrics/startup').json()
+
+    assert {'schema', 'pool', 'catalog_cache', 'total'} <= timings.keys()
+
+
+def test_lifespan_refuses_database_behind_alembic_head(monkeypatch):
+    monkeypatch.setattr(settings, 'SCHEMA_MODE', 'verify')
+
+    with pytest.raises(RuntimeError, match='alembic upgrade head'):
+        with TestClient(create_app()):
+            pass
+
+
+# Schema que o `create_all` gerava antes das migrations
+LEGACY_SCHEMA = (
+    'CREATE TABLE users (id INTEGER NOT NULL PRIMARY KEY, name VARCHAR NOT '
+    'NULL, username VARCHAR NOT NULL UNIQUE, email VARCHAR NOT NULL UNIQUE, '
+    'password VARCHAR NOT NULL, phone VARCHAR NOT NULL)',
+    'CREATE TABLE companies (id INTEGER NOT NULL PRIMARY KEY, cnpj VARCHAR '
+    'NOT NULL UNIQUE, username VARCHAR NOT NULL UNIQUE, email VARCHAR NOT '
+    'NULL UNIQUE, password VARCHAR NOT NULL, phone VARCHAR NOT NULL)',
+    'CREATE TABLE cursos (id INTEGER NOT NULL PRIMARY KEY, name VARCHAR NOT '
+    'NULL, description VARCHAR NOT NULL, youtube_link VARCHAR NOT NULL, '
+    'company_id INTEGER NOT NULL REFERENCES companies (id))',
+    'CREATE INDEX ix_cursos_id ON cursos (id)',
+    'CREATE TABLE inscricoes_cursos (id INTEGER NOT NULL PRIMARY KEY, '
+    'student_id INTEGER REFERENCES users (id), '
+    'course_id INTEGER REFERENCES cursos (id))',
+    'CREATE INDEX ix_inscricoes_cursos_id ON inscricoes_cursos (id)',
+    "INSERT INTO companies VALUES (1, '1', 'acme', 'a@a.com', 'x', '1')",
+    "INSERT INTO cursos VALUES (7, 'Python', 'Curso', 'yt', 1)",
+)
+
+
+def _alembic_upgrade(path, check=True):
+    return subprocess.run(
+        [sys.executable, '-m', 'alembic', 'upgrade', 'head'],
+        cwd=ALEMBIC_INI.parent,
+        env={**os.environ, 'DATABASE_URL': f'sqlite:///{path}'},
+        check=check,
+        capture_output=True,
+    )
+
+
+def _stamped_revisions(path):
+    with sqlite3.connect(path) as conn:
+        if not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'alembic_version'"
+        ).fetchone():
+            return []
+        return conn.execute(
+            'SELECT version_num FROM alembic_version'
+        ).fetchall()
+
+
+def test_alembic_adopts_database_created_before_migrations(tmp_path):
+    path = tmp_path / 'legado.db'
+    with sqlite3.connect(path) as conn:
+        for statement in LEGACY_SCHEMA:
+            conn.execute(statement)
+
+    _alembic_upgrade(path)
+
+    with sqlite3.connect(path) as conn:
+        revision = conn.execute('SELECT version_num FROM alembic_version')
+        assert revision.fetchone()[0] == head_revision()
+        assert conn.execute('SELECT id, name FROM cursos').fetchall() == [
+            (7, 'Python')
+        ]
+
+
+def test_create_mode_database_is_already_at_head(tmp_path):
+    path = tmp_path / 'create.db'
+    engine = create_engine(f'sqlite:///{path}')
+    with engine.begin() as conn:
+        create_schema(conn)
+    engine.dispose()
+
+    _alembic_upgrade(path)
+
+    assert _stamped_revisions(path) == [(head_revision(),)]
+
+
+def test_current_schema_without_stamp_is_not_adopted(tmp_path):
+    # create_all sem stamp (antes do create_schema): o upgrade falha, mas não
+    # deixa o banco marcado na baseline legada
+    path = tmp_path / 'sem_stamp.db'
+    engine = create_engine(f'sqlite:///{path}')
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    assert _alembic_upgrade(path, check=False).returncode != 0
+    assert _stamped_revisions(path) == []
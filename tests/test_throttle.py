@@ -0,0 +1,102 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+
+from fast_tech import app as app_module
+from fast_tech.app import app
+from fast_tech.throttle import (
+    LoginThrottle,
+    MemoryThrottleStore,
+    SQLiteThrottleStore,
+)
+
+RATES = {'ip': (100, 60), 'username': (3, 60)}
+
+
+def test_username_bucket_runs_out_and_refills(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('fast_tech.throttle.time.time', lambda: now[0])
+    throttle = LoginThrottle(MemoryThrottleStore(), RATES)
+
+    waits = [
+        asyncio.run(throttle.check('student', 'ana', '10.0.0.1'))
+        for _ in range(4)
+    ]
+    now[0] += 1
+
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3] == pytest.approx(1)
+    assert asyncio.run(throttle.check('student', 'ana', '10.0.0.1')) == 0
+    # Outro username no mesmo IP tem o próprio bucket
+    assert asyncio.run(throttle.check('student', 'bia', '10.0.0.1')) == 0
+
+
+def test_repeated_failures_block_with_growing_delay(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('fast_tech.throttle.time.time', lambda: now[0])
+    throttle = LoginThrottle(
+        MemoryThrottleStore(), RATES, free_failures=2, delays=(1, 4)
+    )
+
+    delays = []
+    for _ in range(5):
+        asyncio.run(throttle.failed('student', 'ana', '10.0.0.1'))
+        delays.append(
+            asyncio.run(throttle.check('student', 'ana', '10.0.0.2'))
+        )
+        now[0] += 3
+
+    assert delays == [0, 0, 1, 2, 4]
+    asyncio.run(throttle.succeeded('student', 'ana'))
+    asyncio.run(throttle.failed('student', 'ana', '10.0.0.3'))
+    assert asyncio.run(throttle.check('student', 'ana', '10.0.0.3')) == 0
+
+
+def test_sparse_failures_on_shared_ip_do_not_add_up(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('fast_tech.throttle.time.time', lambda: now[0])
+    throttle = LoginThrottle(
+        MemoryThrottleStore(), RATES, free_failures=3, delays=(1, 300)
+    )
+
+    # Um erro de digitação por dia, sempre seguido de login válido
+    for day in range(12):
+        asyncio.run(throttle.failed('student', f'aluno{day}', '10.0.0.1'))
+        asyncio.run(throttle.succeeded('student', f'aluno{day}'))
+        now[0] += 86_400
+    now[0] += 30 * 86_400
+    asyncio.run(throttle.failed('student', 'aluno_novo', '10.0.0.1'))
+
+    assert asyncio.run(throttle.check('student', 'outro', '10.0.0.1')) == 0
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / 'throttle.db')
+    first = LoginThrottle(SQLiteThrottleStore(path), RATES)
+    second = LoginThrottle(SQLiteThrottleStore(path), RATES)
+
+    for _ in range(3):
+        asyncio.run(first.check('company', 'acme', '10.0.0.1'))
+
+    assert asyncio.run(second.check('company', 'acme', '10.0.0.9')) > 0
+
+
+def test_login_is_throttled_before_bcrypt(monkeypatch):
+    throttle = LoginThrottle(MemoryThrottleStore(), RATES, free_failures=0)
+    monkeypatch.setattr(app_module, 'login_throttle', throttle)
+    client = TestClient(app)
+    attempt = {'username': 'ninguem', 'password': 'errada'}
+
+    unknown = client.post('/login', json=attempt)
+    blocked = client.post('/login', json=attempt)
+    company = client.post('/companyLogin', json=attempt)
+
+    # Username inexistente responde igual a senha errada
+    assert unknown.status_code == HTTPStatus.BAD_REQUEST
+    assert unknown.json()['detail'] == 'Credenciais inválidas'
+    assert blocked.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert int(blocked.headers['Retry-After']) >= 1
+    # O bloqueio do IP vale para as duas rotas de login
+    assert company.status_code == HTTPStatus.TOO_MANY_REQUESTS